@@ -10,6 +10,7 @@ from app.db.models import Task  # ensure models are imported for table creation
 
 
 # Create tables at import time for simplicity; for real apps use Alembic migrations.
+# Changes to existing tables are applied by app.db.migrate at startup.
 Base.metadata.create_all(bind=engine)
 
 
@@ -1,13 +1,73 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routers import tasks  # adjust import if your router file name differs
+from app.api.deps import SessionLocal, engine
+from app.api.routers import admission, jobs, tasks  # adjust import if your router file name differs
+from app.core.admission import AdmissionControlMiddleware, AdmissionStats
+from app.core.scheduler import Scheduler
+from app.db.migrate import upgrade
+from app.services import archive, reminders, snapshot
+
+
+def build_scheduler() -> Scheduler:
+    scheduler = Scheduler()
+    # Due-date scans run by default; set the interval to 0 to turn them off.
+    if reminders.DUE_SCAN_INTERVAL_SECONDS > 0:
+        scheduler.add_job(
+            "due_scan",
+            partial(reminders.scan_with_session, SessionLocal, reminders.sinks_from_env()),
+            interval=reminders.DUE_SCAN_INTERVAL_SECONDS,
+        )
+    # Archival is opt-in: set TODO_ARCHIVE_AFTER_DAYS to enable it.
+    if archive.ARCHIVE_AFTER_DAYS:
+        scheduler.add_job(
+            "archive",
+            partial(
+                archive.archive_with_session,
+                SessionLocal,
+                older_than=timedelta(days=float(archive.ARCHIVE_AFTER_DAYS)),
+            ),
+            interval=archive.ARCHIVE_INTERVAL_SECONDS,
+        )
+    if snapshot.SNAPSHOT_ENABLED and snapshot.SNAPSHOT_CHECK_INTERVAL_SECONDS > 0:
+        scheduler.add_job(
+            "snapshot_check",
+            partial(snapshot.check_and_repair, SessionLocal),
+            interval=snapshot.SNAPSHOT_CHECK_INTERVAL_SECONDS,
+        )
+    return scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(upgrade, engine)
+    # Opt-in in-memory read engine for GET /v1/tasks/ (TODO_SNAPSHOT_ENGINE=1).
+    if snapshot.SNAPSHOT_ENABLED:
+        await asyncio.to_thread(snapshot.task_snapshot.load, SessionLocal)
+    app.state.scheduler = build_scheduler()
+    await app.state.scheduler.start()
+    yield
+    await app.state.scheduler.stop()
+    if snapshot.SNAPSHOT_ENABLED:
+        snapshot.task_snapshot.unload()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="To-Do List API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Per-client rate limits and load shedding; added before CORS so rejections
+# still carry CORS headers for the browser.
+app.state.admission_stats = AdmissionStats()
+app.add_middleware(AdmissionControlMiddleware, stats=app.state.admission_stats)
+
 # Enable CORS (important for frontend connection)
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +79,8 @@ app.add_middleware(
 
 # Include routers
 app.include_router(tasks.router, prefix="/v1/tasks", tags=["tasks"])
+app.include_router(jobs.router, prefix="/v1/jobs", tags=["jobs"])
+app.include_router(admission.router, prefix="/v1/admission", tags=["admission"])
 
 # Root endpoint
 @app.get("/")
@@ -0,0 +1,15 @@
+from dataclasses import asdict
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+
+router = APIRouter(tags=["admission"])
+
+# ---------------------------
+# GET /v1/admission
+# ---------------------------
+@router.get("/")
+def admission_metrics(request: Request) -> Dict[str, Any]:
+    """Requests admitted, rate limited (429) and shed (503) since startup."""
+    stats = getattr(request.app.state, "admission_stats", None)
+    return asdict(stats) if stats is not None else {}
@@ -0,0 +1,14 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+
+router = APIRouter(tags=["jobs"])
+
+# ---------------------------
+# GET /v1/jobs
+# ---------------------------
+@router.get("/")
+def job_metrics(request: Request) -> Dict[str, Any]:
+    """Run counts, durations and last results for background jobs."""
+    scheduler = getattr(request.app.state, "scheduler", None)
+    return scheduler.snapshot() if scheduler is not None else {}
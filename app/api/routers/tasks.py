@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, Request, status, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Callable, List, Literal, Optional
 
 from app.api import deps
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from app.core.admission import client_key
+from app.schemas.task import BatchRequest, BatchResult, TaskCreate, TaskRead, TaskUpdate
 from app.schemas.error import ErrorResponse
+from app.services import idempotency
 from app.services import tasks as task_service
 
 router = APIRouter(tags=["tasks"])
@@ -17,9 +20,24 @@ def list_tasks(
     task_id: Optional[int] = None,
     status: Optional[str] = None,
     priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    include_archived: bool = False,
+    sort: Literal["id", "due_date"] = "id",
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(deps.get_db),
 ):
-    return task_service.list_tasks(db, task_id=task_id, status=status, priority=priority)
+    return task_service.list_tasks(
+        db,
+        task_id=task_id,
+        status=status,
+        priority=priority,
+        tag=tag,
+        include_archived=include_archived,
+        sort=sort,
+        limit=limit,
+        offset=offset,
+    )
 
 
 # ---------------------------
@@ -31,8 +49,52 @@ def list_tasks(
     status_code=status.HTTP_201_CREATED,
     responses={400: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
 )
-def create_task(task: TaskCreate, db: Session = Depends(deps.get_db)):
-    return task_service.create_task(db, task)
+def create_task(
+    task: TaskCreate,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    if idempotency_key is None:
+        return task_service.create_task(db, task)
+    return _idempotent(
+        db,
+        request,
+        scope="POST /v1/tasks/",
+        key=idempotency_key,
+        payload=task,
+        status_code=status.HTTP_201_CREATED,
+        operation=lambda: TaskRead.model_validate(task_service.stage_task(db, task)).model_dump(mode="json"),
+    )
+
+
+# ---------------------------
+# POST /v1/tasks/batch
+# ---------------------------
+@router.post(
+    "/batch",
+    response_model=List[BatchResult],
+    responses={422: {"model": ErrorResponse}},
+)
+def batch_tasks(
+    payload: BatchRequest,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    if idempotency_key is None:
+        return task_service.apply_batch(db, payload.operations)
+    return _idempotent(
+        db,
+        request,
+        scope="POST /v1/tasks/batch",
+        key=idempotency_key,
+        payload=payload,
+        status_code=status.HTTP_200_OK,
+        operation=lambda: [
+            r.model_dump(mode="json") for r in task_service.stage_batch(db, payload.operations)
+        ],
+    )
 
 
 # ---------------------------
@@ -65,3 +127,38 @@ def delete_task(task_id: int, db: Session = Depends(deps.get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
+
+
+def _idempotent(
+    db: Session,
+    request: Request,
+    *,
+    scope: str,
+    key: str,
+    payload: Any,
+    status_code: int,
+    operation: Callable[[], Any],
+) -> JSONResponse:
+    try:
+        code, body, replayed = idempotency.execute(
+            db,
+            # Keys are per client, so one client cannot replay another's response.
+            scope=f"{_client_identity(request)} {scope}",
+            key=key,
+            request_hash=idempotency.fingerprint(payload),
+            status_code=status_code,
+            operation=operation,
+        )
+    except idempotency.IdempotencyConflict as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    return JSONResponse(
+        status_code=code,
+        content=body,
+        headers={"Idempotent-Replayed": "true" if replayed else "false"},
+    )
+
+
+def _client_identity(request: Request) -> str:
+    # Same identity admission control rate-limits on; resolved by the
+    # middleware with its own config when it is installed.
+    return getattr(request.state, "client_key", None) or client_key(request.scope)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Protocol
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Comma-separated API keys that identify a client on their own. Any other
+# value in the header is ignored, since unauthenticated keys are free to rotate.
+API_KEYS = frozenset(filter(None, (k.strip() for k in os.getenv("TODO_API_KEYS", "").split(","))))
+
+
+@dataclass
+class AdmissionConfig:
+    """Per-client token buckets plus global concurrency limits, split by reads/writes."""
+
+    enabled: bool = True
+    read_rate: float = 50.0
+    read_burst: float = 100.0
+    write_rate: float = 10.0
+    write_burst: float = 20.0
+    # Keep read + write slots within the SQLAlchemy pool (5 + 10 overflow) so
+    # admitted requests never queue on a connection checkout.
+    read_concurrency: int = 8
+    write_concurrency: int = 4
+    max_queue: int = 64
+    queue_timeout: float = 2.0
+    api_key_header: str = "x-api-key"
+    api_keys: frozenset = field(default_factory=lambda: API_KEYS)
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        env = os.getenv
+        return cls(
+            enabled=env("TODO_ADMISSION_ENABLED", "1") not in ("0", "false", "False"),
+            read_rate=float(env("TODO_RATE_READ_PER_SEC", cls.read_rate)),
+            read_burst=float(env("TODO_RATE_READ_BURST", cls.read_burst)),
+            write_rate=float(env("TODO_RATE_WRITE_PER_SEC", cls.write_rate)),
+            write_burst=float(env("TODO_RATE_WRITE_BURST", cls.write_burst)),
+            read_concurrency=int(env("TODO_READ_CONCURRENCY", cls.read_concurrency)),
+            write_concurrency=int(env("TODO_WRITE_CONCURRENCY", cls.write_concurrency)),
+            max_queue=int(env("TODO_ADMISSION_QUEUE", cls.max_queue)),
+            queue_timeout=float(env("TODO_ADMISSION_QUEUE_TIMEOUT", cls.queue_timeout)),
+        )
+
+
+@dataclass
+class AdmissionStats:
+    """Admission decisions so far; pass one in to read them from outside the middleware."""
+
+    admitted: int = 0
+    rate_limited: int = 0
+    shed: int = 0
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, rate: float, burst: float) -> float:
+        """Take one token for ``key``.
+
+        Returns 0.0 when admitted, otherwise the number of seconds until a
+        token becomes available.
+        """
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets held in process memory; fine for a single API worker."""
+
+    def __init__(self, max_keys: int = 10_000) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, list[float]]" = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    # Drop the least recently seen client, never everyone.
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[key] = [burst, now]
+            else:
+                self._buckets.move_to_end(key)
+
+            tokens, last = bucket
+            tokens = min(burst, tokens + (now - last) * rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate if rate > 0 else math.inf
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded wait queue; callers beyond the queue are shed."""
+
+    def __init__(self, limit: int, max_queue: int, timeout: float) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._sem: asyncio.Semaphore | None = None
+
+    async def acquire(self) -> bool:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.limit)
+        if self._sem.locked():
+            if self.waiting >= self.max_queue:
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._sem.acquire()
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        assert self._sem is not None
+        self._sem.release()
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that rate-limits per client and sheds load when saturated.
+
+    Clients are identified by the API key header when it carries one of the
+    configured ``api_keys``, otherwise by peer IP. Over-budget clients get 429; requests that cannot get a
+    concurrency slot within the queue bounds get 503.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        config: AdmissionConfig | None = None,
+        backend: RateLimitBackend | None = None,
+        stats: AdmissionStats | None = None,
+    ) -> None:
+        self.app = app
+        self.config = config or AdmissionConfig.from_env()
+        self.backend = backend or InMemoryRateLimitBackend()
+        cfg = self.config
+        self.limiters = {
+            "read": ConcurrencyLimiter(cfg.read_concurrency, cfg.max_queue, cfg.queue_timeout),
+            "write": ConcurrencyLimiter(cfg.write_concurrency, cfg.max_queue, cfg.queue_timeout),
+        }
+        self.stats = stats if stats is not None else AdmissionStats()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cfg = self.config
+        # Handlers that key state per client (idempotency) read it as request.state.client_key.
+        client = client_key(scope, cfg)
+        scope.setdefault("state", {})["client_key"] = client
+        if not cfg.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        kind = "read" if scope["method"] in READ_METHODS else "write"
+        if kind == "read":
+            rate, burst = cfg.read_rate, cfg.read_burst
+        else:
+            rate, burst = cfg.write_rate, cfg.write_burst
+
+        retry_after = await self.backend.acquire(f"{kind}:{client}", rate, burst)
+        if retry_after > 0:
+            self.stats.rate_limited += 1
+            await _reject(send, 429, "Rate limit exceeded", retry_after)
+            return
+
+        limiter = self.limiters[kind]
+        if not await limiter.acquire():
+            self.stats.shed += 1
+            await _reject(send, 503, "Server busy, retry later", 1.0)
+            return
+
+        self.stats.admitted += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def client_key(scope: Scope, config: AdmissionConfig | None = None) -> str:
+    """Identity used for per-client budgets: a configured API key, else peer IP."""
+    cfg = config or _DEFAULT_CONFIG
+    if cfg.api_keys:
+        header = cfg.api_key_header.encode("latin-1")
+        for name, value in scope.get("headers", ()):
+            if name == header:
+                key = value.decode("latin-1")
+                if key in cfg.api_keys:
+                    return "key:" + key
+                break
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+_DEFAULT_CONFIG = AdmissionConfig()
+
+
+async def _reject(send: Send, status: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    retry = "60" if math.isinf(retry_after) else str(max(1, math.ceil(retry_after)))
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry.encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
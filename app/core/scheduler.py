@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    last_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    last_started_at: datetime | None = None
+    last_error: str | None = None
+    last_result: Any = None
+
+
+@dataclass
+class _Job:
+    name: str
+    fn: Callable[[], Any]
+    interval: float
+    metrics: JobMetrics = field(default_factory=JobMetrics)
+
+
+class Scheduler:
+    """Run blocking jobs periodically in worker threads on the app's event loop.
+
+    Each job runs once at start and then every ``interval`` seconds after the
+    previous run finishes, so a slow run never overlaps itself. A failing run
+    is logged and counted; the job keeps its schedule.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: List[_Job] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(self, name: str, fn: Callable[[], Any], interval: float) -> None:
+        if any(job.name == name for job in self._jobs):
+            raise ValueError(f"Job {name!r} is already scheduled")
+        self._jobs.append(_Job(name=name, fn=fn, interval=interval))
+
+    async def start(self) -> None:
+        for job in self._jobs:
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def run_once(self, name: str) -> Any:
+        job = next(job for job in self._jobs if job.name == name)
+        return await self._run(job)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            job.name: {
+                "interval_seconds": job.interval,
+                "runs": job.metrics.runs,
+                "failures": job.metrics.failures,
+                "last_duration_ms": round(job.metrics.last_duration_ms, 3),
+                "max_duration_ms": round(job.metrics.max_duration_ms, 3),
+                "last_started_at": job.metrics.last_started_at,
+                "last_error": job.metrics.last_error,
+                "last_result": job.metrics.last_result,
+            }
+            for job in self._jobs
+        }
+
+    async def _loop(self, job: _Job) -> None:
+        while True:
+            await self._run(job)
+            await asyncio.sleep(job.interval)
+
+    async def _run(self, job: _Job) -> Any:
+        metrics = job.metrics
+        metrics.last_started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(job.fn)
+        except Exception as exc:
+            metrics.failures += 1
+            metrics.last_error = repr(exc)
+            logger.exception("Scheduled job %s failed", job.name)
+            result = None
+        else:
+            metrics.last_error = None
+            metrics.last_result = result
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            metrics.runs += 1
+            metrics.last_duration_ms = elapsed_ms
+            metrics.max_duration_ms = max(metrics.max_duration_ms, elapsed_ms)
+        return result
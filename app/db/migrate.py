@@ -0,0 +1,82 @@
+"""Bring an existing database up to date with the models.
+
+``create_all`` only creates missing tables. ``upgrade`` also applies the
+changes it cannot make to tables that already exist. The API runs it at
+startup; to run it on its own:
+
+    python -m app.db.migrate
+"""
+from __future__ import annotations
+
+from sqlalchemy import Connection, Engine, func, select, text
+
+from app.db import Base, engine as default_engine
+from app.db.models import Task, TaskArchive
+
+
+def upgrade(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        _sqlite_autoincrement_tasks(engine)
+    _create_missing_indexes(engine)
+
+
+def _create_missing_indexes(engine: Engine) -> None:
+    """Add indexes declared after ``tasks`` was first created."""
+    with engine.begin() as conn:
+        for index in Task.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _sqlite_autoincrement_tasks(engine: Engine) -> None:
+    """Rebuild ``tasks`` with AUTOINCREMENT so archived or deleted ids are never reused.
+
+    Without it SQLite hands out ``max(id) + 1``. Postgres sequences never
+    reuse ids, so only SQLite needs this.
+    """
+    with engine.connect() as conn:
+        sql = conn.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"))
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return
+
+    # pysqlite runs DDL outside its implicit transactions; manage one by hand
+    # so a failure leaves the old table untouched.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            _rebuild_tasks(conn)
+        except Exception:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        conn.exec_driver_sql("COMMIT")
+
+
+def _rebuild_tasks(conn: Connection) -> None:
+    indexes = conn.scalars(
+        text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks' AND sql IS NOT NULL")
+    ).all()
+    for name in indexes:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    conn.exec_driver_sql("ALTER TABLE tasks RENAME TO _tasks_old")
+    Task.__table__.create(conn)
+
+    columns = ", ".join(c.name for c in Task.__table__.columns)
+    conn.exec_driver_sql(f"INSERT INTO tasks ({columns}) SELECT {columns} FROM _tasks_old")
+    conn.exec_driver_sql("DROP TABLE _tasks_old")
+
+    # Start past every id already handed out, archived ones included.
+    last_id = max(
+        conn.scalar(select(func.max(Task.id))) or 0,
+        conn.scalar(select(func.max(TaskArchive.id))) or 0,
+    )
+    conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+    conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', :seq)"), {"seq": last_id})
+
+
+def main() -> None:
+    upgrade(default_engine)
+    print(f"Upgraded {default_engine.url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
-from .task import Task
+from .task import Task, TaskArchive
+from .idempotency import IdempotencyKey
+from .job import JobWatermark
 
-__all__ = ["Task"]
+__all__ = ["Task", "TaskArchive", "IdempotencyKey", "JobWatermark"]
@@ -3,17 +3,16 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import List
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import JSON
 
 from app.db import Base
 
 
-class Task(Base):
-    __tablename__ = "tasks"
+class TaskColumns:
+    """Columns shared by the hot ``tasks`` table and ``tasks_archive``."""
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="todo")
@@ -30,3 +29,30 @@ class Task(Base):
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
+
+
+class Task(TaskColumns, Base):
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Lets the archive job find old done tasks without scanning open work.
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+        # Range scans for tasks coming due.
+        Index("ix_tasks_due_date", "due_date"),
+        # Never hand out an id again once its row is archived or deleted.
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+
+class TaskArchive(TaskColumns, Base):
+    __tablename__ = "tasks_archive"
+
+    # Archived rows keep the id they had in ``tasks``.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
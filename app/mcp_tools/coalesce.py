@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Tuple
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller runs ``fn``; callers arriving while it is running block
+    until it finishes and receive the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "_Call"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)`` where ``shared`` is True for followers."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    """Tiny thread-safe memo for read results, invalidated by local writes."""
+
+    def __init__(self, ttl: float, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items: Dict[Hashable, Tuple[float, Any]] = {}
+        # Bumped on every invalidation so a read that started before a write
+        # cannot repopulate the cache with pre-write data.
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        if self.ttl <= 0:
+            return False, None
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return False, None
+            return True, value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if len(self._items) >= self.max_entries:
+                self._items.clear()
+            self._items[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+
+class ToolMetrics:
+    """Per-tool call counts and latency, plus coalescing hit counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tools: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, tool: str) -> Dict[str, float]:
+        entry = self._tools.get(tool)
+        if entry is None:
+            entry = self._tools[tool] = {
+                "calls": 0,
+                "errors": 0,
+                "http_requests": 0,
+                "cache_hits": 0,
+                "coalesced": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+            }
+        return entry
+
+    @contextmanager
+    def track(self, tool: str) -> Iterator[None]:
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            with self._lock:
+                entry = self._entry(tool)
+                entry["calls"] += 1
+                entry["errors"] += int(failed)
+                entry["total_ms"] += elapsed_ms
+                entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def incr(self, tool: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._entry(tool)[counter] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out: Dict[str, Dict[str, float]] = {}
+            for tool, entry in self._tools.items():
+                calls = entry["calls"]
+                out[tool] = {
+                    **entry,
+                    "avg_ms": round(entry["total_ms"] / calls, 3) if calls else 0.0,
+                    "total_ms": round(entry["total_ms"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                }
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
@@ -1,16 +1,75 @@
 from __future__ import annotations
 import os
+import uuid
 from typing import Optional, Literal, List, Dict, Any
 
 import requests
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from app.mcp_tools.coalesce import SingleFlight, TTLCache, ToolMetrics
+except ImportError:  # launched as a script: python app/mcp_tools/server.py
+    from coalesce import SingleFlight, TTLCache, ToolMetrics
+
 
 mcp = FastMCP("to-do-list")
 
 
 BASE_URL = os.getenv("TODO_API_BASE_URL", "http://127.0.0.1:8000")
 TASKS_PATH = "/v1/tasks/" 
+BATCH_PATH = "/v1/tasks/batch"
+# Sent as X-API-Key so the API's admission control gives this server its own
+# budget; list the same value in the API's TODO_API_KEYS.
+API_KEY = os.getenv("TODO_API_KEY")
+
+# Identical list calls share one in-flight request and are memoized briefly;
+# any write made through this server clears the memo.
+READ_CACHE_TTL = float(os.getenv("TODO_MCP_READ_TTL", "2.0"))
+
+metrics = ToolMetrics()
+_inflight = SingleFlight()
+_read_cache = TTLCache(ttl=READ_CACHE_TTL)
+
+
+def _headers(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    headers = {"X-API-Key": API_KEY} if API_KEY else {}
+    headers.update(extra or {})
+    return headers
+
+
+def _fetch_tasks(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    metrics.incr("list_tasks", "http_requests")
+    resp = requests.get(url, params=params, headers=_headers(), timeout=15)
+    try:
+        data = resp.json()
+    except Exception:
+        data = {"message": resp.text}
+
+    return {
+        "ok": resp.ok,
+        "status": resp.status_code,
+        "url": resp.url,
+        "data": data,
+    }
+
+
+def _send_write(tool: str, method: str, url: str, retries: int = 0, **kwargs: Any) -> requests.Response:
+    """Send a write; ``retries`` is only safe for requests carrying an Idempotency-Key."""
+    kwargs["headers"] = _headers(kwargs.get("headers"))
+    with metrics.track(tool):
+        attempt = 0
+        try:
+            while True:
+                metrics.incr(tool, "http_requests")
+                try:
+                    return requests.request(method, url, timeout=15, **kwargs)
+                except (requests.Timeout, requests.ConnectionError):
+                    if attempt >= retries:
+                        raise
+                    attempt += 1
+        finally:
+            # Even a failed or timed-out write may have landed server-side.
+            _read_cache.invalidate()
 
 
 @mcp.tool(title="List Tasks", description="List tasks with optional filters. Returns structured JSON.")
@@ -20,6 +79,8 @@ def list_tasks(
     tag: Optional[str] = None,
     limit: Optional[int] = None,
     offset: Optional[int] = None,
+    include_archived: bool = False,
+    sort: Optional[Literal["id", "due_date"]] = None,
 ) -> Dict[str, Any]:
     params: Dict[str, Any] = {}
     if status:
@@ -32,29 +93,44 @@ def list_tasks(
         params["limit"] = int(limit)
     if offset is not None:
         params["offset"] = int(offset)
+    if include_archived:
+        params["include_archived"] = "true"
+    if sort:
+        params["sort"] = sort
 
     url = f"{BASE_URL}{TASKS_PATH}"
-    resp = requests.get(url, params=params, timeout=15)
-    try:
-        data = resp.json()
-    except Exception:
-        data = {"message": resp.text}
+    key = tuple(sorted(params.items()))
+    with metrics.track("list_tasks"):
+        hit, cached = _read_cache.get(key)
+        if hit:
+            metrics.incr("list_tasks", "cache_hits")
+            return cached
 
-    return {
-        "ok": resp.ok,
-        "status": resp.status_code,
-        "url": resp.url,
-        "data": data,
-    }
+        # Keying the flight on the generation stops a read issued after a local
+        # write from joining a request that started before it.
+        generation = _read_cache.generation
+        result, shared = _inflight.do((generation, key), lambda: _fetch_tasks(url, params))
+        if shared:
+            metrics.incr("list_tasks", "coalesced")
+        elif result["ok"]:
+            _read_cache.set(key, result, generation)
+        return result
 
 
-@mcp.tool(title="Create Task", description="Create a new task via POST /v1/tasks. Returns structured JSON.")
+@mcp.tool(
+    title="Create Task",
+    description=(
+        "Create a new task via POST /v1/tasks. Pass the same idempotency_key when retrying "
+        "to avoid duplicates. Returns structured JSON."
+    ),
+)
 def create_task(
     title: str,
     description: Optional[str] = None,
     due_date: Optional[str] = None,
     priority: Optional[Literal["low", "med", "high"]] = None,
     tags: Optional[List[str]] = None,
+    idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     payload: Dict[str, Any] = {"title": title}
     if description is not None:
@@ -67,7 +143,10 @@ def create_task(
         payload["tags"] = tags
 
     url = f"{BASE_URL}{TASKS_PATH}"
-    resp = requests.post(url, json=payload, timeout=15)
+    # Reuse the caller's key across agent-level retries; a generated key still
+    # makes our own retry after a timeout safe.
+    headers = {"Idempotency-Key": idempotency_key or uuid.uuid4().hex}
+    resp = _send_write("create_task", "POST", url, retries=1, json=payload, headers=headers)
     try:
         data = resp.json()
     except Exception:
@@ -115,7 +194,7 @@ def update_task(
         }
 
     url = f"{BASE_URL}{TASKS_PATH}{int(task_id)}"
-    resp = requests.patch(url, json=payload, timeout=15)
+    resp = _send_write("update_task", "PATCH", url, json=payload)
     try:
         data = resp.json()
     except Exception:
@@ -132,7 +211,7 @@ def update_task(
 @mcp.tool(title="Delete Task", description="Delete a task via DELETE /v1/tasks/{task_id}. Returns structured JSON.")
 def delete_task(task_id: int) -> Dict[str, Any]:
     url = f"{BASE_URL}{TASKS_PATH}{int(task_id)}"
-    resp = requests.delete(url, timeout=15)
+    resp = _send_write("delete_task", "DELETE", url)
     try:
         # Some APIs return JSON body; others return 204 with no body
         data = resp.json()
@@ -147,5 +226,43 @@ def delete_task(task_id: int) -> Dict[str, Any]:
     }
 
 
+@mcp.tool(
+    title="Batch Tasks",
+    description=(
+        "Apply several operations in one POST /v1/tasks/batch call. Each operation is "
+        '{"op": "create", "data": {...}}, {"op": "update", "task_id": 1, "data": {...}} '
+        'or {"op": "delete", "task_id": 1}. Returns per-operation results.'
+    ),
+)
+def batch(operations: List[Dict[str, Any]], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    if not operations:
+        return {
+            "ok": False,
+            "status": 400,
+            "url": f"{BASE_URL}{BATCH_PATH}",
+            "data": {"detail": "No operations provided"},
+        }
+
+    url = f"{BASE_URL}{BATCH_PATH}"
+    headers = {"Idempotency-Key": idempotency_key or uuid.uuid4().hex}
+    resp = _send_write("batch", "POST", url, retries=1, json={"operations": operations}, headers=headers)
+    try:
+        data = resp.json()
+    except Exception:
+        data = {"message": resp.text}
+
+    return {
+        "ok": resp.ok,
+        "status": resp.status_code,
+        "url": url,
+        "data": data,
+    }
+
+
+@mcp.tool(title="Tool Metrics", description="Per-tool call counts, latency and request coalescing stats.")
+def tool_metrics() -> Dict[str, Any]:
+    return {"ok": True, "data": metrics.snapshot()}
+
+
 if __name__ == "__main__":
     mcp.run()
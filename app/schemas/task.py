@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -79,3 +79,36 @@ class TaskUpdate(BaseModel):
         if not v.strip():
             raise ValueError("title must be non-empty")
         return v
+
+
+class BatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TaskCreate
+
+
+class BatchUpdate(BaseModel):
+    op: Literal["update"]
+    task_id: int
+    data: TaskUpdate
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    task_id: int
+
+
+BatchOperation = Annotated[
+    Union[BatchCreate, BatchUpdate, BatchDelete], Field(discriminator="op")
+]
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=500)
+
+
+class BatchResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    status: int
+    task_id: int | None = None
+    task: TaskRead | None = None
+    detail: str | None = None
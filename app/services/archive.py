@@ -0,0 +1,108 @@
+"""Move old completed tasks from ``tasks`` into ``tasks_archive``.
+
+Run once from the command line:
+
+    python -m app.services.archive --older-than-days 30
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import DateTime, delete, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.models.task import Task, TaskArchive
+from app.services.snapshot import task_snapshot
+
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_AFTER_DAYS = os.getenv("TODO_ARCHIVE_AFTER_DAYS")
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("TODO_ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+_TASK_COLUMNS = [c.name for c in Task.__table__.columns]
+
+
+def archive_done_tasks(
+    db: Session,
+    *,
+    older_than: timedelta,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    now: datetime | None = None,
+) -> int:
+    """Archive ``done`` tasks not updated within ``older_than``.
+
+    Each batch is copied and deleted in its own transaction so the SQLite
+    writer lock is only held briefly. Returns the number of archived tasks.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - older_than
+    total = 0
+    while True:
+        ids = db.scalars(
+            select(Task.id)
+            .where(Task.status == "done", Task.updated_at < cutoff)
+            .order_by(Task.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        # Rows can be reopened or edited after the id select; repeat its
+        # filter so only tasks still eligible are copied and removed.
+        eligible = (Task.id.in_(ids), Task.status == "done", Task.updated_at < cutoff)
+        try:
+            db.execute(
+                insert(TaskArchive).from_select(
+                    _TASK_COLUMNS + ["archived_at"],
+                    select(
+                        *(Task.__table__.c[name] for name in _TASK_COLUMNS),
+                        literal(now, DateTime(timezone=True)),
+                    ).where(*eligible),
+                )
+            )
+            deleted = set(db.scalars(delete(Task).where(*eligible).returning(Task.id)))
+            # Without SQLite's single writer, a row can still change between
+            # the two statements; drop copies of tasks that stayed live.
+            db.execute(delete(TaskArchive).where(TaskArchive.id.in_(ids), TaskArchive.id.not_in(deleted)))
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        # Core deletes bypass the ORM events that keep the snapshot current.
+        if task_snapshot.serves(db):
+            task_snapshot.discard(deleted)
+
+        total += len(deleted)
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+def archive_with_session(session_factory, *, older_than: timedelta) -> dict:
+    """Scheduler entry point: archive with a fresh session and report the count."""
+    with session_factory() as db:
+        return {"archived": archive_done_tasks(db, older_than=older_than)}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Archive completed tasks.")
+    parser.add_argument("--older-than-days", type=float, required=True)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    from app.api.deps import SessionLocal, engine  # creates tables on import
+    from app.db.migrate import upgrade
+
+    # Archiving without AUTOINCREMENT on tasks would let new tasks reuse archived ids.
+    upgrade(engine)
+    with SessionLocal() as db:
+        moved = archive_done_tasks(
+            db, older_than=timedelta(days=args.older_than_days), batch_size=args.batch_size
+        )
+    print(f"Archived {moved} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.models.idempotency import IdempotencyKey
+
+IDEMPOTENCY_TTL = timedelta(hours=float(os.getenv("TODO_IDEMPOTENCY_TTL_HOURS", "24")))
+PRUNE_INTERVAL_SECONDS = 60.0
+
+_last_prune = 0.0
+_locks_guard = threading.Lock()
+_locks: dict[tuple[str, str], list] = {}
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a request with a different payload."""
+
+
+def fingerprint(payload: BaseModel) -> str:
+    body = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def execute(
+    db: Session,
+    *,
+    scope: str,
+    key: str,
+    request_hash: str,
+    status_code: int,
+    operation: Callable[[], Any],
+) -> tuple[int, Any, bool]:
+    """Run ``operation`` at most once per ``(scope, key)``.
+
+    ``operation`` must stage its writes without committing and return a
+    JSON-serializable response body; it is committed together with the
+    idempotency record. Returns ``(status_code, body, replayed)``. Concurrent
+    duplicates in this process wait for the first attempt; duplicates from
+    other processes are resolved by the unique constraint.
+    """
+    with _key_lock(scope, key):
+        record = _lookup(db, scope, key, request_hash)
+        if record is not None:
+            return record.status_code, record.response_body, True
+
+        try:
+            body = operation()
+            db.add(
+                IdempotencyKey(
+                    scope=scope,
+                    key=key,
+                    request_hash=request_hash,
+                    status_code=status_code,
+                    response_body=body,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            record = _lookup(db, scope, key, request_hash)
+            if record is None:
+                raise
+            return record.status_code, record.response_body, True
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+
+    _maybe_prune(db)
+    return status_code, body, False
+
+
+def prune_expired(db: Session, *, now: datetime | None = None) -> int:
+    cutoff = (now or datetime.now(timezone.utc)) - IDEMPOTENCY_TTL
+    try:
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff))
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return result.rowcount or 0
+
+
+def _lookup(db: Session, scope: str, key: str, request_hash: str) -> IdempotencyKey | None:
+    record = db.scalars(
+        select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+    ).first()
+    if record is None:
+        return None
+
+    created_at = record.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    if created_at < datetime.now(timezone.utc) - IDEMPOTENCY_TTL:
+        # Expired but not yet pruned: treat the key as unused.
+        db.delete(record)
+        db.flush()
+        return None
+
+    if record.request_hash != request_hash:
+        raise IdempotencyConflict("Idempotency-Key was already used with a different request payload")
+    return record
+
+
+def _maybe_prune(db: Session) -> None:
+    global _last_prune
+    now = time.monotonic()
+    if now - _last_prune < PRUNE_INTERVAL_SECONDS:
+        return
+    _last_prune = now
+    try:
+        prune_expired(db)
+    except SQLAlchemyError:
+        # Pruning is housekeeping; never fail the request over it.
+        pass
+
+
+@contextmanager
+def _key_lock(scope: str, key: str) -> Iterator[None]:
+    ident = (scope, key)
+    with _locks_guard:
+        entry = _locks.get(ident)
+        if entry is None:
+            entry = _locks[ident] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                _locks.pop(ident, None)
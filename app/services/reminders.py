@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Protocol
+
+import requests
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.models.job import JobWatermark
+from app.db.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "due_scan"
+DUE_SCAN_INTERVAL_SECONDS = float(os.getenv("TODO_DUE_SCAN_INTERVAL_SECONDS", "60"))
+DUE_SINKS = os.getenv("TODO_DUE_SINKS", "log,pubsub")
+DUE_WEBHOOK_URL = os.getenv("TODO_DUE_WEBHOOK_URL")
+# How long a failing sink's events are retried before they are dropped.
+DUE_RETRY_WINDOW = timedelta(hours=float(os.getenv("TODO_DUE_RETRY_WINDOW_HOURS", "24")))
+# Most events handed to a sink in one emit() call (one webhook POST).
+DUE_EMIT_BATCH_SIZE = int(os.getenv("TODO_DUE_EMIT_BATCH_SIZE", "100"))
+
+
+@dataclass(frozen=True)
+class DueTaskEvent:
+    task_id: int
+    title: str
+    status: str
+    priority: str
+    due_date: datetime
+    detected_at: datetime
+
+    def to_json(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["due_date"] = self.due_date.isoformat()
+        data["detected_at"] = self.detected_at.isoformat()
+        return data
+
+
+class EventSink(Protocol):
+    # Identifies the sink's watermark, so it must be stable across restarts.
+    name: str
+
+    def emit(self, events: List[DueTaskEvent]) -> None:
+        ...
+
+
+class LogSink:
+    name = "log"
+
+    def emit(self, events: List[DueTaskEvent]) -> None:
+        for event in events:
+            logger.info("Task %d %r is due at %s", event.task_id, event.title, event.due_date.isoformat())
+
+
+class WebhookSink:
+    """POST each scan's events as one JSON document to ``url``."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5.0, post: Callable[..., Any] = requests.post) -> None:
+        self.url = url
+        self.timeout = timeout
+        self._post = post
+
+    def emit(self, events: List[DueTaskEvent]) -> None:
+        resp = self._post(self.url, json={"events": [e.to_json() for e in events]}, timeout=self.timeout)
+        resp.raise_for_status()
+
+
+class PubSubSink:
+    """Fan events out to in-process subscribers, each with its own queue."""
+
+    name = "pubsub"
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+
+    def subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=self.maxsize)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def emit(self, events: List[DueTaskEvent]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            for event in events:
+                try:
+                    q.put_nowait(event)
+                except queue.Full:
+                    # A stalled subscriber must not block the scan.
+                    logger.warning("Dropping due-task event %d for a full subscriber", event.task_id)
+
+
+# Process-wide bus so other modules can subscribe to due-task events.
+due_events = PubSubSink()
+
+
+def sinks_from_env(names: str = DUE_SINKS, webhook_url: str | None = DUE_WEBHOOK_URL) -> List[EventSink]:
+    sinks: List[EventSink] = []
+    for name in filter(None, (n.strip() for n in names.split(","))):
+        if name == "log":
+            sinks.append(LogSink())
+        elif name == "pubsub":
+            sinks.append(due_events)
+        elif name == "webhook":
+            if not webhook_url:
+                raise ValueError("TODO_DUE_WEBHOOK_URL is required for the webhook sink")
+            sinks.append(WebhookSink(webhook_url))
+        else:
+            raise ValueError(f"Unknown due-task sink {name!r}")
+    return sinks
+
+
+def scan_due_tasks(
+    db: Session,
+    sinks: Iterable[EventSink],
+    *,
+    now: datetime | None = None,
+    retry_window: timedelta = DUE_RETRY_WINDOW,
+    batch_size: int = DUE_EMIT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Emit events for open tasks whose due date passed since each sink's last scan.
+
+    Every sink has its own watermark, and only the window ``(oldest
+    watermark, now]`` is queried, using the due_date index. A sink's first
+    scan starts at ``now`` instead of replaying history. Events reach each
+    sink in chunks of ``batch_size``. When a chunk fails, the sink's
+    watermark stops before it, so the rest is retried on the next scan while
+    the other sinks move on. Events older than ``retry_window`` are logged
+    and dropped instead of being retried forever.
+    """
+    now = now or datetime.now(timezone.utc)
+    sinks = list(sinks)
+    watermarks: Dict[str, JobWatermark] = {}
+    for sink in sinks:
+        if sink.name not in watermarks:
+            name = f"{WATERMARK_NAME}:{sink.name}"
+            watermark = db.get(JobWatermark, name)
+            if watermark is None:
+                watermark = JobWatermark(name=name, value=now)
+                db.add(watermark)
+            watermarks[sink.name] = watermark
+    floor = now - retry_window
+    starts: Dict[str, datetime] = {}
+    dropped = 0
+    for name, watermark in watermarks.items():
+        start = _as_utc(watermark.value)
+        if start < floor:
+            dropped += _drop_expired(db, name, start, floor)
+            start = floor
+        starts[name] = start
+    since = min(starts.values(), default=now)
+
+    rows = db.scalars(
+        select(Task)
+        .where(Task.due_date > since, Task.due_date <= now, Task.status != "done")
+        .order_by(Task.due_date, Task.id)
+    ).all()
+    events = [
+        DueTaskEvent(
+            task_id=t.id,
+            title=t.title,
+            status=t.status,
+            priority=t.priority,
+            due_date=_as_utc(t.due_date),
+            detected_at=now,
+        )
+        for t in rows
+    ]
+
+    failed = set()
+    progress = dict.fromkeys(watermarks, now)
+    for sink in sinks:
+        pending = [e for e in events if e.due_date > starts[sink.name]]
+        for i in range(0, len(pending), batch_size):
+            try:
+                sink.emit(pending[i : i + batch_size])
+            except Exception:
+                failed.add(sink.name)
+                logger.exception("Due-task sink %s failed; retrying next scan", sink.name)
+                # Resume after the delivered events; ones sharing the failed
+                # chunk's first due date are sent again.
+                first = pending[i].due_date
+                delivered = max((e.due_date for e in pending[:i] if e.due_date < first), default=starts[sink.name])
+                progress[sink.name] = min(progress[sink.name], delivered)
+                break
+    for name, watermark in watermarks.items():
+        watermark.value = progress[name]
+    try:
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+
+    return {
+        "events": len(events),
+        "sink_errors": len(failed),
+        "dropped": dropped,
+        "window_start": since.isoformat(),
+        "window_end": now.isoformat(),
+        # How far behind the slowest sink was when the scan started.
+        "lag_seconds": round((now - since).total_seconds(), 3),
+        # Longest delay between a task coming due and us noticing it.
+        "max_event_delay_seconds": round(max(((now - e.due_date).total_seconds() for e in events), default=0.0), 3),
+    }
+
+
+def _drop_expired(db: Session, sink_name: str, start: datetime, floor: datetime) -> int:
+    ids = db.scalars(
+        select(Task.id)
+        .where(Task.due_date > start, Task.due_date <= floor, Task.status != "done")
+        .order_by(Task.due_date, Task.id)
+    ).all()
+    if ids:
+        logger.warning(
+            "Due-task sink %s is past its retry window; dropping %d events for tasks %s",
+            sink_name,
+            len(ids),
+            ids,
+        )
+    return len(ids)
+
+
+def scan_with_session(session_factory, sinks: Iterable[EventSink]) -> Dict[str, Any]:
+    """Scheduler entry point: run one due-date scan with a fresh session."""
+    with session_factory() as db:
+        return scan_due_tasks(db, sinks)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
@@ -0,0 +1,421 @@
+"""In-process snapshot of the ``tasks`` table for read-heavy list queries.
+
+The snapshot holds one ``__slots__`` record per task plus secondary indexes
+by status, priority and tag and a due-date ordered list. It is loaded from
+the database at startup and kept current by session events on the
+sessionmaker it was loaded from, so every ORM write committed through that
+factory (single writes, batches, idempotent creates) is applied after commit.
+Bulk Core statements bypass those events and must call :meth:`discard`
+themselves, as the archive job does.
+
+The snapshot only reflects writes made by this process; run a single API
+worker when it is enabled.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from heapq import nsmallest
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ENABLED = os.getenv("TODO_SNAPSHOT_ENGINE", "0") not in ("0", "false", "False", "")
+SNAPSHOT_CHECK_INTERVAL_SECONDS = float(os.getenv("TODO_SNAPSHOT_CHECK_INTERVAL_SECONDS", "0"))
+
+SortKey = Literal["id", "due_date"]
+
+_FIELDS = ("id", "title", "description", "status", "priority", "tags", "due_date", "created_at", "updated_at")
+_PENDING_KEY = "task_snapshot_pending"
+
+
+class TaskRecord:
+    """Immutable-by-convention copy of a task row; readable by ``TaskRead``."""
+
+    __slots__ = _FIELDS
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        description: str | None,
+        status: str,
+        priority: str,
+        tags: Tuple[str, ...],
+        due_date: datetime | None,
+        created_at: datetime,
+        updated_at: datetime,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.priority = priority
+        self.tags = tags
+        self.due_date = due_date
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_task(cls, task: Any) -> "TaskRecord":
+        return cls(
+            id=task.id,
+            # Statuses, priorities and tags repeat across millions of rows.
+            title=task.title,
+            description=task.description,
+            status=sys.intern(task.status),
+            priority=sys.intern(task.priority),
+            tags=tuple(sys.intern(t) for t in (task.tags or ())),
+            due_date=_as_utc(task.due_date),
+            created_at=_as_utc(task.created_at),
+            updated_at=_as_utc(task.updated_at),
+        )
+
+    def as_tuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in _FIELDS)
+
+
+class TaskSnapshot:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._bind: Any = None
+        self._factory: sessionmaker | None = None
+        # Changes applied while a load or check streams the table without the lock.
+        self._journals: List[Dict[int, TaskRecord | None]] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        self._records: Dict[int, TaskRecord] = {}
+        self._sorted_ids: List[int] = []
+        self._by_status: Dict[str, Set[int]] = {}
+        self._by_priority: Dict[str, Set[int]] = {}
+        self._by_tag: Dict[str, Set[int]] = {}
+        # Ids of tasks with a due date, kept sorted by (due_date, id).
+        self._due: List[int] = []
+
+    # -- lifecycle -----------------------------------------------------------
+
+    @property
+    def loaded(self) -> bool:
+        return self._bind is not None
+
+    def load(self, session_factory: sessionmaker, *, chunk_size: int = 10_000) -> int:
+        """(Re)build from the database and follow writes made via ``session_factory``.
+
+        The table is read into a fresh set of indexes while queries keep using
+        the current ones; writes committed meanwhile are replayed onto the new
+        indexes before they are swapped in.
+        """
+        # Listen before reading so no commit falls between the read and the swap.
+        if self._factory is not session_factory:
+            self._unlisten()
+            event.listen(session_factory, "after_flush", _collect_changes)
+            event.listen(session_factory, "after_commit", self._apply_pending)
+            event.listen(session_factory, "after_soft_rollback", _drop_pending)
+            self._factory = session_factory
+
+        fresh = TaskSnapshot()
+        with self._journal() as changed, session_factory() as db:
+            bind = db.get_bind()
+            for task in db.scalars(select(Task).order_by(Task.id).execution_options(yield_per=chunk_size)):
+                fresh._add(TaskRecord.from_task(task), ordered=True)
+            fresh._due.sort(key=fresh._due_key)
+            with self._lock:
+                fresh._apply(changed)
+                self._records = fresh._records
+                self._sorted_ids = fresh._sorted_ids
+                self._by_status = fresh._by_status
+                self._by_priority = fresh._by_priority
+                self._by_tag = fresh._by_tag
+                self._due = fresh._due
+                self._bind = bind
+        return len(fresh._records)
+
+    def unload(self) -> None:
+        self._unlisten()
+        with self._lock:
+            self._reset()
+            self._bind = None
+
+    def _unlisten(self) -> None:
+        if self._factory is None:
+            return
+        event.remove(self._factory, "after_flush", _collect_changes)
+        event.remove(self._factory, "after_commit", self._apply_pending)
+        event.remove(self._factory, "after_soft_rollback", _drop_pending)
+        self._factory = None
+
+    def serves(self, db: Session) -> bool:
+        """True when ``db`` talks to the database this snapshot mirrors."""
+        return self._bind is not None and db.get_bind() is self._bind
+
+    # -- writes --------------------------------------------------------------
+
+    def upsert(self, record: TaskRecord) -> None:
+        with self._lock:
+            self._apply({record.id: record})
+
+    def discard(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._apply(dict.fromkeys(ids))
+
+    def _apply(self, changes: Dict[int, TaskRecord | None]) -> None:
+        """Replace or drop records by id; ``None`` means deleted. Caller holds the lock."""
+        for task_id, record in changes.items():
+            if task_id in self._records:
+                self._remove(task_id)
+            if record is not None:
+                self._add(record)
+        for journal in self._journals:
+            journal.update(changes)
+
+    @contextmanager
+    def _journal(self) -> Iterator[Dict[int, TaskRecord | None]]:
+        changed: Dict[int, TaskRecord | None] = {}
+        with self._lock:
+            self._journals.append(changed)
+        try:
+            yield changed
+        finally:
+            with self._lock:
+                self._journals.remove(changed)
+
+    def _add(self, record: TaskRecord, *, ordered: bool = False) -> None:
+        task_id = record.id
+        self._records[task_id] = record
+        if ordered or not self._sorted_ids or task_id > self._sorted_ids[-1]:
+            self._sorted_ids.append(task_id)
+        else:
+            insort(self._sorted_ids, task_id)
+        self._by_status.setdefault(record.status, set()).add(task_id)
+        self._by_priority.setdefault(record.priority, set()).add(task_id)
+        for tag in record.tags:
+            self._by_tag.setdefault(tag, set()).add(task_id)
+        if record.due_date is not None:
+            if ordered:
+                self._due.append(task_id)  # sorted once after loading
+            else:
+                insort(self._due, task_id, key=self._due_key)
+
+    def _remove(self, task_id: int) -> None:
+        record = self._records[task_id]
+        if record.due_date is not None:
+            i = bisect_left(self._due, self._due_key(task_id), key=self._due_key)
+            del self._due[i]
+        del self._records[task_id]
+        i = bisect_left(self._sorted_ids, task_id)
+        del self._sorted_ids[i]
+        _discard_from(self._by_status, record.status, task_id)
+        _discard_from(self._by_priority, record.priority, task_id)
+        for tag in record.tags:
+            _discard_from(self._by_tag, tag, task_id)
+
+    def _due_key(self, task_id: int) -> Tuple[datetime, int]:
+        return self._records[task_id].due_date, task_id
+
+    def _apply_pending(self, session: Session) -> None:
+        pending: Dict[int, TaskRecord | None] | None = session.info.pop(_PENDING_KEY, None)
+        if not pending:
+            return
+        with self._lock:
+            self._apply(pending)
+
+    # -- reads ---------------------------------------------------------------
+
+    def query(
+        self,
+        *,
+        task_id: int | None = None,
+        status: str | None = None,
+        priority: str | None = None,
+        tag: str | None = None,
+        sort: SortKey = "id",
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> List[TaskRecord]:
+        """Answer ``list_tasks`` filters, ordering and paging from memory."""
+        with self._lock:
+            if task_id is not None:
+                record = self._records.get(task_id)
+                matches = [record] if record is not None and _matches(record, status, priority, tag) else []
+                return _page(matches, limit, offset)
+
+            filters = self._filters(status, priority, tag)
+            wanted = None if limit is None else offset + limit
+            if sort == "due_date":
+                ids = self._ids_by_due_date(filters, wanted)
+            else:
+                ids = self._ids_by_id(filters, wanted)
+            records = self._records
+            return [records[i] for i in _page(ids, limit, offset)]
+
+    def _filters(self, status: str | None, priority: str | None, tag: str | None) -> List[Set[int]]:
+        """Index sets to match, smallest first; empty means no filter."""
+        sets = []
+        for index, value in ((self._by_status, status), (self._by_priority, priority), (self._by_tag, tag)):
+            if value is not None:
+                sets.append(index.get(value, set()))
+        sets.sort(key=len)
+        return sets
+
+    def _ids_by_id(self, filters: List[Set[int]], wanted: int | None) -> List[int]:
+        if not filters:
+            return self._sorted_ids if wanted is None else self._sorted_ids[:wanted]
+        smallest, rest = filters[0], filters[1:]
+        # Dense filters with a page size: walk the id order and stop early
+        # instead of materializing the whole intersection.
+        if wanted is not None and len(smallest) * 8 > len(self._sorted_ids):
+            return _take(_matching(self._sorted_ids, filters), wanted)
+        matches = _matching(smallest, rest)
+        return sorted(matches) if wanted is None else nsmallest(wanted, matches)
+
+    def _ids_by_due_date(self, filters: List[Set[int]], wanted: int | None) -> List[int]:
+        # Due tasks first in due order, then undated tasks by id (matches SQL).
+        records = self._records
+        dated = _matching(self._due, filters)
+        undated = (i for i in _matching(self._sorted_ids, filters) if records[i].due_date is None)
+
+        def chained() -> Iterator[int]:
+            yield from dated
+            yield from undated
+
+        return _take(chained(), wanted)
+
+    # -- diagnostics ---------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "tasks": len(self._records),
+                "statuses": {k: len(v) for k, v in self._by_status.items()},
+                "priorities": {k: len(v) for k, v in self._by_priority.items()},
+                "tags": len(self._by_tag),
+                "with_due_date": len(self._due),
+            }
+
+    def check_consistency(self, db: Session, *, chunk_size: int = 10_000) -> List[str]:
+        """Compare every row against the snapshot; returns human-readable diffs.
+
+        Rows are read without the lock and compared a chunk at a time. Tasks
+        written through the snapshot during the check are skipped, since the
+        rows read for them may predate the write.
+        """
+        problems: List[str] = []
+        seen: Set[int] = set()
+        with self._journal() as changed:
+            rows = db.scalars(select(Task).order_by(Task.id).execution_options(yield_per=chunk_size))
+            for chunk in rows.partitions():
+                fresh = [TaskRecord.from_task(task) for task in chunk]
+                with self._lock:
+                    for record in fresh:
+                        seen.add(record.id)
+                        if record.id in changed:
+                            continue
+                        current = self._records.get(record.id)
+                        if current is None:
+                            problems.append(f"task {record.id} missing from snapshot")
+                        elif current.as_tuple() != record.as_tuple():
+                            problems.append(f"task {record.id} differs from database")
+
+        with self._lock:
+            for task_id in self._records.keys() - seen - changed.keys():
+                problems.append(f"task {task_id} in snapshot but not in database")
+
+            indexed = sum(len(ids) for ids in self._by_status.values())
+            if indexed != len(self._records) or len(self._sorted_ids) != len(self._records):
+                problems.append("secondary indexes out of sync with records")
+        return problems
+
+
+# Process-wide engine used by app.services.tasks.list_tasks once loaded.
+task_snapshot = TaskSnapshot()
+
+
+def check_and_repair(session_factory: sessionmaker) -> Dict[str, Any]:
+    """Scheduler entry point: verify the snapshot and reload it on drift."""
+    if not task_snapshot.loaded:
+        return {"checked": False}
+    with session_factory() as db:
+        problems = task_snapshot.check_consistency(db)
+    if problems:
+        logger.warning("Task snapshot drifted (%d problems, e.g. %s); reloading", len(problems), problems[0])
+        task_snapshot.load(session_factory)
+    return {"checked": True, "problems": len(problems)}
+
+
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in session.new:
+        if isinstance(obj, Task):
+            pending[obj.id] = TaskRecord.from_task(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Task) and obj not in session.deleted:
+            pending[obj.id] = TaskRecord.from_task(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            pending[obj.id] = None
+
+
+def _drop_pending(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _matching(ids: Iterable[int], filters: List[Set[int]]) -> Iterator[int]:
+    if not filters:
+        return iter(ids)
+    if len(filters) == 1:
+        only = filters[0]
+        return (i for i in ids if i in only)
+    return (i for i in ids if all(i in f for f in filters))
+
+
+def _matches(record: TaskRecord, status: str | None, priority: str | None, tag: str | None) -> bool:
+    return (
+        (status is None or record.status == status)
+        and (priority is None or record.priority == priority)
+        and (tag is None or tag in record.tags)
+    )
+
+
+def _discard_from(index: Dict[str, Set[int]], key: str, task_id: int) -> None:
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(task_id)
+        if not ids:
+            del index[key]
+
+
+def _take(items: Iterable[int], n: int | None) -> List[int]:
+    if n is None:
+        return list(items)
+    out: List[int] = []
+    for item in items:
+        if len(out) >= n:
+            break
+        out.append(item)
+    return out
+
+
+def _page(items: List[Any], limit: int | None, offset: int) -> List[Any]:
+    end = None if limit is None else offset + limit
+    return items[offset:end]
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import heapq
 from datetime import datetime, timezone
+from itertools import islice
 from typing import List
 
+from sqlalchemy import cast, func, select
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.db.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.db.models.task import Task, TaskArchive
+from app.services.snapshot import SortKey, TaskRecord, task_snapshot
+from app.schemas.task import (
+    BatchCreate,
+    BatchOperation,
+    BatchResult,
+    BatchUpdate,
+    TaskCreate,
+    TaskRead,
+    TaskUpdate,
+)
 
 def delete_task(db: Session, task_id: int) -> bool:
     task = db.get(Task, task_id)
@@ -28,24 +41,101 @@ def list_tasks(
     task_id: int | None = None,
     status: str | None = None,
     priority: str | None = None,
-) -> list[Task]:
-    q = db.query(Task)
-    if task_id is not None:
-        q = q.filter(Task.id == task_id)
-    if status is not None:
-        q = q.filter(Task.status == status)
-    if priority is not None:
-        q = q.filter(Task.priority == priority)
-
-    items = q.order_by(Task.id.asc()).all()
+    tag: str | None = None,
+    include_archived: bool = False,
+    sort: SortKey = "id",
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[Task | TaskArchive | TaskRecord]:
+    if not include_archived and task_snapshot.serves(db):
+        return task_snapshot.query(
+            task_id=task_id,
+            status=status,
+            priority=priority,
+            tag=tag,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+        )
+
+    models = (Task, TaskArchive) if include_archived else (Task,)
+    results: list[list[Task | TaskArchive]] = []
+    for model in models:
+        q = db.query(model)
+        if task_id is not None:
+            q = q.filter(model.id == task_id)
+        if status is not None:
+            q = q.filter(model.status == status)
+        if priority is not None:
+            q = q.filter(model.priority == priority)
+        if tag is not None:
+            q = q.filter(_has_tag(db, model, tag))
+        if sort == "due_date":
+            q = q.order_by(model.due_date.is_(None), model.due_date.asc(), model.id.asc())
+        else:
+            q = q.order_by(model.id.asc())
+        if include_archived:
+            # The page can come from either table; fetch enough of each to merge.
+            q = q.limit(None if limit is None else offset + limit)
+        else:
+            q = q.offset(offset or None).limit(limit)
+        results.append(q.all())
+
+    if include_archived:
+        merged = heapq.merge(*results, key=_sort_key(sort))
+        items = list(islice(merged, offset, None if limit is None else offset + limit))
+    else:
+        items = results[0]
     for t in items:
         _normalize_task_datetimes(t)
     return items
 
 
+def _has_tag(db: Session, model: type[Task] | type[TaskArchive], tag: str):
+    """Exact, case-sensitive match against one element of the JSON ``tags`` array."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(model.tags, JSONB).contains([tag])
+    # SQLite (and anything else with json_each); LIKE on the text would ignore case.
+    elements = func.json_each(model.tags).table_valued("value")
+    return select(elements.c.value).where(elements.c.value == tag).exists()
+
+
+def _sort_key(sort: SortKey):
+    if sort == "due_date":
+        return lambda t: (t.due_date is None, _as_naive_utc(t.due_date), t.id)
+    return lambda t: t.id
+
+
+def _as_naive_utc(value: datetime | None) -> datetime:
+    if value is None:
+        return datetime.min
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
 def create_task(db: Session, payload: TaskCreate) -> Task:
-    now = datetime.now(timezone.utc)
-    task = Task(
+    try:
+        task = stage_task(db, payload)
+        db.commit()
+        db.refresh(task)
+        _normalize_task_datetimes(task)
+        return task
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+
+
+def stage_task(db: Session, payload: TaskCreate) -> Task:
+    """Add and flush a new task without committing, so callers can commit it
+    together with other rows (e.g. an idempotency record)."""
+    task = _build_task(payload, datetime.now(timezone.utc))
+    db.add(task)
+    db.flush()
+    _normalize_task_datetimes(task)
+    return task
+
+
+def _build_task(payload: TaskCreate, now: datetime) -> Task:
+    return Task(
         title=payload.title.strip(),
         description=payload.description,
         status="todo",
@@ -55,18 +145,19 @@ def create_task(db: Session, payload: TaskCreate) -> Task:
         created_at=now,
         updated_at=now,
     )
-    try:
-        db.add(task)
-        db.commit()
-        db.refresh(task)
-        _normalize_task_datetimes(task)
-        return task
-    except SQLAlchemyError:
-        db.rollback()
-        raise
 
 
-def _normalize_task_datetimes(task: Task) -> None:
+def _apply_update(task: Task, payload: TaskUpdate, now: datetime) -> None:
+    updates = payload.model_dump(exclude_unset=True)
+    for key, value in updates.items():
+        if key == "title" and isinstance(value, str):
+            setattr(task, key, value.strip())
+        else:
+            setattr(task, key, value)
+    task.updated_at = now
+
+
+def _normalize_task_datetimes(task: Task | TaskArchive) -> None:
     """Ensure datetimes are timezone-aware UTC for API responses.
 
     SQLite often returns naive datetimes. Add UTC tzinfo when missing.
@@ -83,13 +174,7 @@ def update_task(db: Session, task_id: int, payload: TaskUpdate) -> Task | None:
     if not task:
         return None
 
-    updates = payload.model_dump(exclude_unset=True)
-    for key, value in updates.items():
-        if key == "title" and isinstance(value, str):
-            setattr(task, key, value.strip())
-        else:
-            setattr(task, key, value)
-    task.updated_at = datetime.now(timezone.utc)
+    _apply_update(task, payload, datetime.now(timezone.utc))
 
     try:
         db.add(task)
@@ -100,3 +185,51 @@ def update_task(db: Session, task_id: int, payload: TaskUpdate) -> Task | None:
     except SQLAlchemyError:
         db.rollback()
         raise
+
+
+def apply_batch(db: Session, operations: list[BatchOperation]) -> list[BatchResult]:
+    """Run create/update/delete operations in a single transaction.
+
+    Missing tasks are reported per operation (404) rather than aborting the
+    batch; database errors roll back every operation.
+    """
+    try:
+        results = stage_batch(db, operations)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return results
+
+
+def stage_batch(db: Session, operations: list[BatchOperation]) -> list[BatchResult]:
+    """Apply batch operations and flush without committing."""
+    now = datetime.now(timezone.utc)
+    results: list[BatchResult] = []
+    for op in operations:
+        if isinstance(op, BatchCreate):
+            task = _build_task(op.data, now)
+            db.add(task)
+            db.flush()
+            results.append(_batch_result("create", 201, task))
+            continue
+
+        task = db.get(Task, op.task_id)
+        if not task:
+            results.append(
+                BatchResult(op=op.op, status=404, task_id=op.task_id, detail="Task not found")
+            )
+        elif isinstance(op, BatchUpdate):
+            _apply_update(task, op.data, now)
+            db.flush()
+            results.append(_batch_result("update", 200, task))
+        else:
+            db.delete(task)
+            db.flush()
+            results.append(BatchResult(op="delete", status=204, task_id=op.task_id))
+    return results
+
+
+def _batch_result(op: str, status: int, task: Task) -> BatchResult:
+    _normalize_task_datetimes(task)
+    return BatchResult(op=op, status=status, task_id=task.id, task=TaskRead.model_validate(task))
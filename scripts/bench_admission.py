@@ -0,0 +1,168 @@
+"""Measure well-behaved client latency while an abusive client floods the API.
+
+Serves the tasks router with uvicorn in a subprocess (temporary SQLite
+database), floods it from a separate abuser process, and records latency for
+a well-behaved client pacing its own requests. Runs once with admission
+control disabled and once enabled.
+
+    python scripts/bench_admission.py --duration 10 --abuser-threads 64
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import requests
+
+
+def serve(db_path: str, port: int, admission: bool) -> None:
+    import uvicorn
+    from fastapi import FastAPI
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api import deps
+    from app.api.routers import tasks
+    from app.core.admission import AdmissionConfig, AdmissionControlMiddleware
+    from app.db import Base
+
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(tasks.router, prefix="/v1/tasks")
+    app.dependency_overrides[deps.get_db] = get_db
+    config = AdmissionConfig(enabled=admission, api_keys=frozenset({"good", "abuser"}))
+    app.add_middleware(AdmissionControlMiddleware, config=config)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
+
+
+def abuse(base_url: str, threads: int, stop_at: float, counts) -> None:
+    def loop() -> None:
+        session = requests.Session()
+        while time.time() < stop_at:
+            try:
+                status = session.get(f"{base_url}/v1/tasks/", headers={"X-API-Key": "abuser"}, timeout=30).status_code
+            except requests.RequestException:
+                status = 0
+            with counts.get_lock():
+                counts[min(status // 100, 5)] += 1
+
+    workers = [threading.Thread(target=loop) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+
+def seed(db_path: str, n: int) -> None:
+    from sqlalchemy import create_engine, insert
+
+    from app.db import Base
+    from app.db.models import Task
+
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Task), [{"title": f"seed {i}", "tags": []} for i in range(n)])
+    engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str) -> None:
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            requests.get(f"{base_url}/v1/tasks/", timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def run(admission: bool, args: argparse.Namespace, tmp: str) -> None:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    db_path = os.path.join(tmp, f"bench_{admission}.db")
+    seed(db_path, args.seed_tasks)
+    server = mp.Process(target=serve, args=(db_path, port, admission), daemon=True)
+    server.start()
+    try:
+        _wait_ready(base_url)
+
+        counts = mp.Array("i", 6)
+        stop_at = time.time() + args.duration
+        abuser = mp.Process(target=abuse, args=(base_url, args.abuser_threads, stop_at, counts))
+        abuser.start()
+
+        latencies: list[float] = []
+        failures = 0
+        good = requests.Session()
+        while time.time() < stop_at:
+            start = time.perf_counter()
+            try:
+                ok = good.get(f"{base_url}/v1/tasks/", headers={"X-API-Key": "good"}, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if ok:
+                latencies.append(elapsed * 1000.0)
+            else:
+                failures += 1
+            time.sleep(max(0.0, 1.0 / args.good_rps - elapsed))
+        abuser.join()
+    finally:
+        server.terminate()
+        server.join()
+
+    label = "admission on " if admission else "admission off"
+    abuser_stats = {f"{i}xx": counts[i] for i in range(6) if counts[i]}
+    if not latencies:
+        print(f"{label}: no successful well-behaved requests ({failures} failures), abuser={abuser_stats}")
+        return
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label}: good ok={len(latencies):4d} failed={failures:3d} "
+        f"p50={p50:8.2f}ms p99={p99:8.2f}ms abuser={abuser_stats}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--abuser-threads", type=int, default=64)
+    parser.add_argument("--good-rps", type=float, default=20.0)
+    parser.add_argument("--seed-tasks", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for admission in (False, True):
+            run(admission, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Show hot-path list latency as completed-task history grows, with and without archival.
+
+For each history size, a temporary SQLite database gets a fixed number of open
+tasks plus ``history`` old done tasks. ``list_tasks`` latency is measured with
+the history left in ``tasks`` and again after archiving it.
+
+    python scripts/bench_archive.py --history 10000 100000 500000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.db.models import Task
+from app.services import tasks as task_service
+from app.services.archive import archive_done_tasks
+
+
+def seed(Session, open_tasks: int, history: int) -> None:
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=90)
+    with Session() as db:
+        chunk = 10_000
+        for start in range(0, history, chunk):
+            rows = [
+                {"title": f"done {i}", "status": "done", "priority": "med", "tags": [], "created_at": old, "updated_at": old}
+                for i in range(start, min(start + chunk, history))
+            ]
+            db.execute(insert(Task), rows)
+        rows = [
+            {"title": f"open {i}", "status": "todo", "priority": "high", "tags": ["work"], "created_at": now, "updated_at": now}
+            for i in range(open_tasks)
+        ]
+        db.execute(insert(Task), rows)
+        db.commit()
+
+
+def measure(Session, repeat: int, **filters) -> float:
+    samples = []
+    with Session() as db:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            task_service.list_tasks(db, **filters)
+            samples.append((time.perf_counter() - start) * 1000.0)
+            db.expunge_all()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--open-tasks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'history':>9} {'mode':>9} {'list all (ms)':>14} {'priority=high (ms)':>19} {'status=todo (ms)':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for history in args.history:
+            engine = create_engine(f"sqlite+pysqlite:///{os.path.join(tmp, f'h{history}.db')}")
+            Base.metadata.create_all(bind=engine)
+            Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            seed(Session, args.open_tasks, history)
+
+            for mode in ("in tasks", "archived"):
+                if mode == "archived":
+                    with Session() as db:
+                        archive_done_tasks(db, older_than=timedelta(days=30), batch_size=5_000)
+                # Full-history lists are slow; a few samples are enough.
+                list_all = measure(Session, max(1, args.repeat // 5) if mode == "in tasks" else args.repeat)
+                high = measure(Session, args.repeat, priority="high")
+                todo = measure(Session, args.repeat, status="todo")
+                print(f"{history:>9} {mode:>9} {list_all:>14.2f} {high:>19.2f} {todo:>17.2f}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Compare the in-memory task snapshot with the SQL list path.
+
+Seeds a temporary SQLite database, times representative ``list_tasks``
+queries through SQL, loads the snapshot (reporting load time and memory per
+task), times the same queries through it and runs the consistency checker.
+
+    python scripts/bench_snapshot.py --tasks 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.db.models import Task
+from app.services import tasks as task_service
+from app.services.snapshot import task_snapshot
+
+QUERIES = [
+    ("first page", {"limit": 50}),
+    ("status=todo page 20", {"status": "todo", "limit": 50, "offset": 1000}),
+    ("priority=high & tag=work", {"priority": "high", "tag": "work", "limit": 50}),
+    ("sort=due_date page", {"sort": "due_date", "limit": 50}),
+    ("tag=urgent (rare)", {"tag": "urgent", "limit": 50}),
+    ("task_id lookup", {"task_id": None}),  # filled in with a mid-table id
+    ("status=in_progress, all rows", {"status": "in_progress"}),
+]
+
+
+def seed(Session, n: int) -> None:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    statuses = ["done"] * 7 + ["todo"] * 2 + ["in_progress"]
+    tag_pool = [[], ["work"], ["home"], ["work", "home"], ["errands"]]
+    with Session() as db:
+        chunk = 20_000
+        for start in range(0, n, chunk):
+            rows = []
+            for i in range(start, min(start + chunk, n)):
+                created = now - timedelta(minutes=n - i)
+                tags = list(rng.choice(tag_pool))
+                if rng.random() < 0.001:
+                    tags.append("urgent")
+                rows.append(
+                    {
+                        "title": f"task {i}",
+                        "description": None,
+                        "status": rng.choice(statuses),
+                        "priority": rng.choice(("low", "med", "high")),
+                        "tags": tags,
+                        "due_date": created + timedelta(days=rng.randint(1, 60)) if rng.random() < 0.5 else None,
+                        "created_at": created,
+                        "updated_at": created,
+                    }
+                )
+            db.execute(insert(Task), rows)
+        db.commit()
+
+
+def time_queries(Session, repeat: int, n: int) -> dict[str, tuple[float, int]]:
+    results = {}
+    with Session() as db:
+        for name, params in QUERIES:
+            if "task_id" in params:
+                params = {"task_id": n // 2}
+            reps = 1 if "limit" not in params and "task_id" not in params else repeat
+            samples = []
+            for _ in range(reps):
+                start = time.perf_counter()
+                rows = task_service.list_tasks(db, **params)
+                samples.append((time.perf_counter() - start) * 1000.0)
+                db.expunge_all()
+            results[name] = (statistics.median(samples), len(rows))
+    return results
+
+
+def deep_size(snapshot) -> int:
+    """Bytes held by the snapshot's records and indexes, counting shared objects once."""
+    seen: set[int] = set()
+    total = 0
+
+    def add(obj) -> None:
+        nonlocal total
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+
+    for container in (snapshot._records, snapshot._sorted_ids, snapshot._due, snapshot._by_status, snapshot._by_priority, snapshot._by_tag):
+        add(container)
+    for task_id, record in snapshot._records.items():
+        add(task_id)
+        add(record)
+        for name in type(record).__slots__:
+            value = getattr(record, name)
+            if value is not None:
+                add(value)
+                if isinstance(value, tuple):
+                    for item in value:
+                        add(item)
+    for index in (snapshot._by_status, snapshot._by_priority, snapshot._by_tag):
+        for ids in index.values():
+            add(ids)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite+pysqlite:///{os.path.join(tmp, 'snapshot.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        start = time.perf_counter()
+        seed(Session, args.tasks)
+        print(f"seeded {args.tasks} tasks in {time.perf_counter() - start:.1f}s")
+
+        sql = time_queries(Session, args.repeat, args.tasks)
+
+        gc.collect()
+        start = time.perf_counter()
+        task_snapshot.load(Session)
+        print(f"snapshot load: {time.perf_counter() - start:.1f}s")
+        size = deep_size(task_snapshot)
+        print(f"snapshot memory: {size / 2**20:.1f} MiB total, {size / args.tasks:.0f} bytes/task")
+
+        mem = time_queries(Session, args.repeat, args.tasks)
+
+        print(f"\n{'query':<30} {'rows':>7} {'sql (ms)':>10} {'snapshot (ms)':>14} {'speedup':>8}")
+        for name, _ in QUERIES:
+            (sql_ms, rows), (mem_ms, mem_rows) = sql[name], mem[name]
+            assert rows == mem_rows, (name, rows, mem_rows)
+            print(f"{name:<30} {rows:>7} {sql_ms:>10.2f} {mem_ms:>14.3f} {sql_ms / mem_ms:>7.0f}x")
+
+        with Session() as db:
+            start = time.perf_counter()
+            problems = task_snapshot.check_consistency(db)
+        print(f"\nconsistency check: {len(problems)} problems in {time.perf_counter() - start:.1f}s")
+        task_snapshot.unload()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+# The app-wide admission middleware keys every TestClient request to the same
+# client, so the suite would trip its own rate limits. Admission control is
+# covered with dedicated app instances in tests/unit/test_admission.py.
+os.environ.setdefault("TODO_ADMISSION_ENABLED", "0")
+# Scheduled jobs would use the real database, not the per-test overrides.
+os.environ.setdefault("TODO_DUE_SCAN_INTERVAL_SECONDS", "0")
+# Keep the app's own engine (startup migration, scheduled jobs) off ./todo.db.
+os.environ.setdefault("TODO_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='todo-tests-')}/todo.db")
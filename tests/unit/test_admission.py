@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import (
+    AdmissionConfig,
+    AdmissionControlMiddleware,
+    AdmissionStats,
+    ConcurrencyLimiter,
+    InMemoryRateLimitBackend,
+)
+
+
+def _make_client(stats: AdmissionStats | None = None, **overrides) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    def read_items():
+        return []
+
+    @app.post("/items", status_code=201)
+    def create_item():
+        return {"ok": True}
+
+    app.add_middleware(AdmissionControlMiddleware, config=AdmissionConfig(**overrides), stats=stats)
+    return TestClient(app)
+
+
+def test_rate_limit_per_client():
+    client = _make_client(read_rate=0.001, read_burst=2, api_keys=frozenset({"other"}))
+
+    assert client.get("/items").status_code == 200
+    assert client.get("/items").status_code == 200
+    response = client.get("/items")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Rate limit exceeded"}
+    assert int(response.headers["retry-after"]) >= 1
+
+    # A configured API key has its own bucket.
+    assert client.get("/items", headers={"X-API-Key": "other"}).status_code == 200
+
+
+def test_rotating_unknown_keys_share_the_ip_bucket():
+    client = _make_client(read_rate=0.001, read_burst=2, api_keys=frozenset({"known"}))
+
+    statuses = [client.get("/items", headers={"X-API-Key": f"rotating-{i}"}).status_code for i in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def test_stats_count_admission_decisions():
+    stats = AdmissionStats()
+    client = _make_client(stats, read_rate=0.001, read_burst=1)
+    client.get("/items")
+    client.get("/items")
+    assert stats == AdmissionStats(admitted=1, rate_limited=1, shed=0)
+
+
+def test_admission_endpoint_serves_app_stats():
+    from app.api.main import app
+
+    with TestClient(app) as client:
+        body = client.get("/v1/admission/").json()
+    assert set(body) == {"admitted", "rate_limited", "shed"}
+
+
+def test_reads_and_writes_have_separate_budgets():
+    client = _make_client(read_rate=0.001, read_burst=1, write_rate=0.001, write_burst=1)
+
+    assert client.get("/items").status_code == 200
+    assert client.get("/items").status_code == 429
+    assert client.post("/items").status_code == 201
+    assert client.post("/items").status_code == 429
+
+
+def test_disabled_admits_everything():
+    client = _make_client(enabled=False, read_rate=0.001, read_burst=1)
+    assert all(client.get("/items").status_code == 200 for _ in range(5))
+
+
+def test_in_memory_backend_refills():
+    backend = InMemoryRateLimitBackend()
+
+    async def run():
+        assert await backend.acquire("k", rate=1000.0, burst=1) == 0.0
+        assert await backend.acquire("k", rate=1000.0, burst=1) > 0.0
+        await asyncio.sleep(0.01)
+        assert await backend.acquire("k", rate=1000.0, burst=1) == 0.0
+
+    asyncio.run(run())
+
+
+def test_in_memory_backend_evicts_least_recent_client():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+
+    async def run():
+        assert await backend.acquire("a", rate=0.001, burst=1) == 0.0
+        assert await backend.acquire("b", rate=0.001, burst=1) == 0.0
+        # Touch "a" so "b" becomes the least recently seen bucket.
+        assert await backend.acquire("a", rate=0.001, burst=1) > 0.0
+        assert await backend.acquire("c", rate=0.001, burst=1) == 0.0
+        # "a" kept its exhausted bucket; only "b" was evicted.
+        assert await backend.acquire("a", rate=0.001, burst=1) > 0.0
+        assert await backend.acquire("b", rate=0.001, burst=1) == 0.0
+
+    asyncio.run(run())
+
+
+def test_concurrency_limiter_sheds_when_queue_full():
+    async def run():
+        limiter = ConcurrencyLimiter(limit=1, max_queue=1, timeout=1.0)
+        assert await limiter.acquire()
+
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        # Queue is full: shed immediately.
+        assert await limiter.acquire() is False
+
+        limiter.release()
+        assert await queued is True
+        limiter.release()
+
+    asyncio.run(run())
+
+
+def test_concurrency_limiter_times_out_waiters():
+    async def run():
+        limiter = ConcurrencyLimiter(limit=1, max_queue=4, timeout=0.01)
+        assert await limiter.acquire()
+        assert await limiter.acquire() is False
+        assert limiter.waiting == 0
+
+    asyncio.run(run())
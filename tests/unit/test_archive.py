@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text, update
+from sqlalchemy.orm import sessionmaker
+
+from app.api.main import app
+from app.api import deps
+from app.db import Base
+from app.db.migrate import upgrade
+from app.db.models import Task, TaskArchive
+from app.services.archive import archive_done_tasks
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    db_path = tmp_path / "test_archive.db"
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def _seed(session_factory, rows):
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        for title, status, age_days in rows:
+            updated = now - timedelta(days=age_days)
+            db.add(Task(title=title, status=status, priority="med", tags=[], created_at=updated, updated_at=updated))
+        db.commit()
+
+
+def test_archive_moves_only_old_done_tasks(session_factory):
+    _seed(
+        session_factory,
+        [
+            ("old done 1", "done", 40),
+            ("old done 2", "done", 40),
+            ("recent done", "done", 1),
+            ("old todo", "todo", 40),
+            ("newest", "done", 40),
+        ],
+    )
+
+    with session_factory() as db:
+        moved = archive_done_tasks(db, older_than=timedelta(days=30), batch_size=1)
+        assert moved == 3
+        assert sorted(t.title for t in db.query(TaskArchive).all()) == ["newest", "old done 1", "old done 2"]
+        assert sorted(t.title for t in db.query(Task).all()) == ["old todo", "recent done"]
+
+
+def test_task_reopened_mid_batch_is_not_archived(session_factory):
+    _seed(session_factory, [("stays done", "done", 40), ("reopened", "done", 40)])
+    engine = session_factory.kw["bind"]
+    reopened = []
+
+    def reopen_before_copy(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks_archive") and not reopened:
+            # Another writer, after the ids were selected but before the copy.
+            with session_factory() as other:
+                other.execute(update(Task).where(Task.title == "reopened").values(status="todo"))
+                other.commit()
+            reopened.append(True)
+
+    event.listen(engine, "before_cursor_execute", reopen_before_copy)
+    try:
+        with session_factory() as db:
+            assert archive_done_tasks(db, older_than=timedelta(days=30)) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", reopen_before_copy)
+
+    with session_factory() as db:
+        assert reopened
+        assert [t.title for t in db.query(TaskArchive).all()] == ["stays done"]
+        assert [(t.title, t.status) for t in db.query(Task).all()] == [("reopened", "todo")]
+
+
+def test_new_task_never_reuses_an_archived_or_deleted_id(session_factory, client: TestClient):
+    _seed(session_factory, [("open", "todo", 0), ("newest", "done", 40)])
+    with session_factory() as db:
+        assert archive_done_tasks(db, older_than=timedelta(days=30)) == 1
+        archived_id = db.query(TaskArchive).one().id
+
+    created = client.post("/v1/tasks/", json={"title": "after archive"}).json()
+    assert created["id"] > archived_id
+
+    assert client.delete(f"/v1/tasks/{created['id']}").status_code == 204
+    assert client.post("/v1/tasks/", json={"title": "after delete"}).json()["id"] > created["id"]
+
+
+def test_upgrade_rebuilds_legacy_tasks_table_with_autoincrement(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        # Layout created by earlier releases, before AUTOINCREMENT.
+        conn.exec_driver_sql(
+            "CREATE TABLE tasks (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(255) NOT NULL, "
+            "description VARCHAR, status VARCHAR(32) NOT NULL, priority VARCHAR(8) NOT NULL, "
+            "tags JSON NOT NULL, due_date DATETIME, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_tasks_id ON tasks (id)")
+        conn.exec_driver_sql(
+            "INSERT INTO tasks VALUES (1, 'kept', NULL, 'todo', 'med', '[]', NULL, "
+            "'2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+        )
+
+    upgrade(engine)
+    upgrade(engine)  # idempotent
+
+    with engine.begin() as conn:
+        assert "AUTOINCREMENT" in conn.scalar(text("SELECT sql FROM sqlite_master WHERE name = 'tasks'"))
+        assert conn.scalars(text("SELECT title FROM tasks")).all() == ["kept"]
+        conn.exec_driver_sql(
+            "INSERT INTO tasks_archive (id, title, status, priority, tags, created_at, updated_at, archived_at) "
+            "SELECT id, title, status, priority, tags, created_at, updated_at, updated_at FROM tasks"
+        )
+        conn.exec_driver_sql("DELETE FROM tasks")
+
+    with sessionmaker(bind=engine)() as db:
+        db.add(Task(title="new", status="todo", priority="med", tags=[]))
+        db.commit()
+        assert db.query(Task).one().id == 2
+
+
+def test_list_tasks_include_archived(session_factory, client: TestClient):
+    _seed(session_factory, [("archived", "done", 40), ("open", "todo", 0)])
+    with session_factory() as db:
+        assert archive_done_tasks(db, older_than=timedelta(days=30)) == 1
+
+    hot = client.get("/v1/tasks/").json()
+    assert [t["title"] for t in hot] == ["open"]
+
+    everything = client.get("/v1/tasks/", params={"include_archived": "true"}).json()
+    assert [t["title"] for t in everything] == ["archived", "open"]
+
+    done = client.get("/v1/tasks/", params={"include_archived": "true", "status": "done"}).json()
+    assert [t["title"] for t in done] == ["archived"]
+
+
+def test_include_archived_pages_merge_both_tables(session_factory, client: TestClient):
+    base = datetime(2025, 9, 15, tzinfo=timezone.utc)
+    _seed(session_factory, [(f"t{i}", "done" if i % 2 else "todo", 40) for i in range(8)])
+    with session_factory() as db:
+        for i, task in enumerate(db.query(Task).order_by(Task.id)):
+            task.due_date = None if i % 3 == 0 else base - timedelta(days=i)
+        db.commit()
+        assert archive_done_tasks(db, older_than=timedelta(days=30)) == 4
+
+    for sort in ("id", "due_date"):
+        params = {"include_archived": "true", "sort": sort}
+        everything = [t["title"] for t in client.get("/v1/tasks/", params=params).json()]
+        assert len(everything) == 8
+        pages = [
+            [t["title"] for t in client.get("/v1/tasks/", params={**params, "limit": 3, "offset": offset}).json()]
+            for offset in (0, 3, 6)
+        ]
+        assert sum(pages, []) == everything
+        if sort == "due_date":
+            # Dated tasks oldest due first, then undated ones by id.
+            assert everything == ["t7", "t5", "t4", "t2", "t1", "t0", "t3", "t6"]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.main import app
+from app.api import deps
+from app.db import Base
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "test_batch.db"
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def test_batch_mixed_operations(client: TestClient):
+    existing = client.post("/v1/tasks/", json={"title": "Old"}).json()
+    doomed = client.post("/v1/tasks/", json={"title": "Doomed"}).json()
+
+    response = client.post(
+        "/v1/tasks/batch",
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": "New", "priority": "high"}},
+                {"op": "update", "task_id": existing["id"], "data": {"status": "done"}},
+                {"op": "delete", "task_id": doomed["id"]},
+                {"op": "update", "task_id": 99999, "data": {"status": "done"}},
+            ]
+        },
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()
+    assert [r["status"] for r in results] == [201, 200, 204, 404]
+    assert results[0]["task"]["title"] == "New"
+    assert results[1]["task"]["status"] == "done"
+    assert results[3]["detail"] == "Task not found"
+
+    listed = client.get("/v1/tasks/").json()
+    assert {t["title"] for t in listed} == {"Old", "New"}
+
+
+def test_batch_delete_twice_reports_missing(client: TestClient):
+    task = client.post("/v1/tasks/", json={"title": "Once"}).json()
+    response = client.post(
+        "/v1/tasks/batch",
+        json={
+            "operations": [
+                {"op": "delete", "task_id": task["id"]},
+                {"op": "delete", "task_id": task["id"]},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()] == [204, 404]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"operations": []},
+        {"operations": [{"op": "explode", "task_id": 1}]},
+        {"operations": [{"op": "create", "data": {"title": "  "}}]},
+    ],
+)
+def test_batch_validation_errors(client: TestClient, payload):
+    response = client.post("/v1/tasks/batch", json=payload)
+    assert response.status_code == 422
+    assert "detail" in response.json()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.main import app
+from app.api import deps
+from app.api.routers import tasks as tasks_router
+from app.core.admission import AdmissionConfig, AdmissionControlMiddleware
+from app.db import Base
+from app.db.models import IdempotencyKey, Task
+from app.schemas.task import TaskCreate, TaskRead
+from app.services import idempotency
+from app.services import tasks as task_service
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    db_path = tmp_path / "test_idempotency.db"
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def test_create_task_replays_stored_response(client: TestClient):
+    headers = {"Idempotency-Key": "abc-123"}
+    first = client.post("/v1/tasks/", json={"title": "Buy milk"}, headers=headers)
+    second = client.post("/v1/tasks/", json={"title": "Buy milk"}, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert first.json() == second.json()
+    assert first.headers["Idempotent-Replayed"] == "false"
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert len(client.get("/v1/tasks/").json()) == 1
+
+
+def test_create_task_key_reused_with_different_payload(client: TestClient):
+    headers = {"Idempotency-Key": "abc-123"}
+    assert client.post("/v1/tasks/", json={"title": "Buy milk"}, headers=headers).status_code == 201
+    response = client.post("/v1/tasks/", json={"title": "Buy eggs"}, headers=headers)
+    assert response.status_code == 422
+    assert "different request payload" in response.json()["detail"]
+
+
+def test_same_key_from_different_clients_is_independent(session_factory):
+    # Identities come from the installed middleware's config, not the environment.
+    keyed_app = FastAPI()
+    keyed_app.include_router(tasks_router.router, prefix="/v1/tasks")
+    keyed_app.add_middleware(
+        AdmissionControlMiddleware, config=AdmissionConfig(enabled=False, api_keys=frozenset({"alice", "bob"}))
+    )
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    keyed_app.dependency_overrides[deps.get_db] = override_get_db
+    client = TestClient(keyed_app)
+    alice = {"Idempotency-Key": "shared", "X-API-Key": "alice"}
+    bob = {"Idempotency-Key": "shared", "X-API-Key": "bob"}
+
+    first = client.post("/v1/tasks/", json={"title": "Buy milk"}, headers=alice)
+    second = client.post("/v1/tasks/", json={"title": "Buy milk"}, headers=bob)
+    assert second.headers["Idempotent-Replayed"] == "false"
+    assert first.json()["id"] != second.json()["id"]
+    # A different body is not a conflict across clients either.
+    assert client.post("/v1/tasks/", json={"title": "Buy eggs"}, headers={**bob, "X-API-Key": "carol"}).status_code == 201
+    assert client.post("/v1/tasks/", json={"title": "Buy milk"}, headers=alice).headers["Idempotent-Replayed"] == "true"
+
+
+def test_batch_replays_stored_response(client: TestClient):
+    headers = {"Idempotency-Key": "batch-1"}
+    body = {"operations": [{"op": "create", "data": {"title": "A"}}, {"op": "create", "data": {"title": "B"}}]}
+    first = client.post("/v1/tasks/batch", json=body, headers=headers)
+    second = client.post("/v1/tasks/batch", json=body, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert len(client.get("/v1/tasks/").json()) == 2
+
+
+def test_concurrent_duplicates_create_one_task(session_factory):
+    payload = TaskCreate(title="Once only")
+    request_hash = idempotency.fingerprint(payload)
+    results = []
+    barrier = threading.Barrier(4)
+
+    def worker():
+        db = session_factory()
+        try:
+            barrier.wait()
+            results.append(
+                idempotency.execute(
+                    db,
+                    scope="test",
+                    key="same",
+                    request_hash=request_hash,
+                    status_code=201,
+                    operation=lambda: TaskRead.model_validate(task_service.stage_task(db, payload)).model_dump(mode="json"),
+                )
+            )
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert len(results) == 4
+    assert sum(not replayed for _, _, replayed in results) == 1
+    assert len({body["id"] for _, body, _ in results}) == 1
+    with session_factory() as db:
+        assert db.query(Task).count() == 1
+
+
+def test_prune_expired(session_factory):
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        for key, age in [("old", idempotency.IDEMPOTENCY_TTL + timedelta(minutes=1)), ("fresh", timedelta(0))]:
+            db.add(
+                IdempotencyKey(
+                    scope="test",
+                    key=key,
+                    request_hash="h",
+                    status_code=201,
+                    response_body={},
+                    created_at=now - age,
+                )
+            )
+        db.commit()
+
+        assert idempotency.prune_expired(db, now=now) == 1
+        assert [r.key for r in db.query(IdempotencyKey).all()] == ["fresh"]
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import sessionmaker
 
 from app.api.main import app
 from app.api import deps
 from app.db import Base
+from app.db.models import Task
+from app.services.tasks import _has_tag
 
 
 @pytest.fixture()
@@ -78,4 +83,11 @@ def test_list_tasks_with_filters(client: TestClient):
     # Filter by priority
     response = client.get("/v1/tasks/", params={"priority": "high"})
     assert response.status_code == 200
-    assert [t["id"] for t in response.json()] == [t1["id"]]
\ No newline at end of file
+    assert [t["id"] for t in response.json()] == [t1["id"]]
+
+def test_tag_filter_uses_jsonb_containment_on_postgres():
+    dialect = postgresql.dialect()
+    db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=dialect))
+    compiled = _has_tag(db, Task, "Work").compile(dialect=dialect)
+    assert "CAST(tasks.tags AS JSONB) @>" in str(compiled)
+    assert list(compiled.params.values()) == [["Work"]]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.mcp_tools.coalesce import SingleFlight, TTLCache, ToolMetrics
+
+
+def test_singleflight_shares_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(timeout=5)
+        return {"ok": True}
+
+    results = []
+
+    def worker():
+        results.append(flight.do("k", slow))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=worker) for _ in range(4)]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(timeout=5)
+
+    assert calls == 1
+    assert len(results) == 5
+    assert sum(shared for _, shared in results) == 4
+    assert all(value == {"ok": True} for value, _ in results)
+
+
+def test_ttl_cache_ignores_stale_generation():
+    cache = TTLCache(ttl=60)
+    generation = cache.generation
+    cache.invalidate()
+    cache.set("k", 1, generation)
+    assert cache.get("k") == (False, None)
+
+    cache.set("k", 2, cache.generation)
+    assert cache.get("k") == (True, 2)
+    cache.invalidate()
+    assert cache.get("k") == (False, None)
+
+
+def test_tool_metrics_counts_errors():
+    metrics = ToolMetrics()
+    with metrics.track("list_tasks"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.track("list_tasks"):
+            raise RuntimeError("boom")
+
+    snap = metrics.snapshot()["list_tasks"]
+    assert snap["calls"] == 2
+    assert snap["errors"] == 1
+
+
+def test_server_list_tasks_memoized_until_write(monkeypatch):
+    pytest.importorskip("mcp.server.fastmcp")
+    from app.mcp_tools import server
+
+    class FakeResponse:
+        ok = True
+        status_code = 200
+        url = "http://test/v1/tasks/"
+        text = "[]"
+
+        def json(self):
+            return []
+
+    gets = []
+    monkeypatch.setattr(server.requests, "get", lambda url, **kw: gets.append(kw) or FakeResponse())
+    monkeypatch.setattr(server.requests, "request", lambda method, url, **kw: FakeResponse())
+    server._read_cache.invalidate()
+    server.metrics.reset()
+
+    server.list_tasks(status="todo")
+    server.list_tasks(status="todo")
+    assert len(gets) == 1
+
+    server.delete_task(1)
+    server.list_tasks(status="todo")
+    assert len(gets) == 2
+    assert server.metrics.snapshot()["list_tasks"]["cache_hits"] == 1
+
+
+def test_server_read_after_write_does_not_join_older_flight(monkeypatch):
+    pytest.importorskip("mcp.server.fastmcp")
+    from app.mcp_tools import server
+
+    started = threading.Event()
+    release = threading.Event()
+    gets = []
+
+    class FakeResponse:
+        ok = True
+        status_code = 200
+        url = "http://test/v1/tasks/"
+        text = "[]"
+
+        def __init__(self, data):
+            self._data = data
+
+        def json(self):
+            return self._data
+
+    def fake_get(url, **kw):
+        gets.append(kw)
+        if len(gets) == 1:
+            # The first (pre-write) request stalls until after the write.
+            started.set()
+            release.wait(timeout=5)
+            return FakeResponse([])
+        return FakeResponse([{"id": 1}])
+
+    monkeypatch.setattr(server.requests, "get", fake_get)
+    monkeypatch.setattr(server.requests, "request", lambda method, url, **kw: FakeResponse({"id": 1}))
+    server._read_cache.invalidate()
+
+    stale = []
+    reader = threading.Thread(target=lambda: stale.append(server.list_tasks()))
+    reader.start()
+    started.wait(timeout=5)
+
+    server.create_task(title="mine")
+    fresh = server.list_tasks()
+    release.set()
+    reader.join(timeout=5)
+
+    assert len(gets) == 2
+    assert fresh["data"] == [{"id": 1}]
+    assert stale[0]["data"] == []
+
+
+def test_server_sends_configured_api_key(monkeypatch):
+    pytest.importorskip("mcp.server.fastmcp")
+    from app.mcp_tools import server
+
+    class FakeResponse:
+        ok = True
+        status_code = 201
+        url = "http://test/v1/tasks/"
+        text = "{}"
+
+        def json(self):
+            return {}
+
+    sent = []
+    monkeypatch.setattr(server, "API_KEY", "mcp-local")
+    monkeypatch.setattr(server.requests, "get", lambda url, **kw: sent.append(kw["headers"]) or FakeResponse())
+    monkeypatch.setattr(server.requests, "request", lambda method, url, **kw: sent.append(kw["headers"]) or FakeResponse())
+    server._read_cache.invalidate()
+
+    server.list_tasks()
+    server.create_task(title="keyed", idempotency_key="k1")
+
+    assert sent[0] == {"X-API-Key": "mcp-local"}
+    assert sent[1] == {"X-API-Key": "mcp-local", "Idempotency-Key": "k1"}
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app.api.main import app
+from app.core.scheduler import Scheduler
+from app.db import Base
+from app.db.migrate import upgrade
+from app.db.models import Task
+from app.services.reminders import PubSubSink, WebhookSink, scan_due_tasks
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    db_path = tmp_path / "test_reminders.db"
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _add_task(session_factory, title, due_date, status="todo"):
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        db.add(Task(title=title, status=status, priority="med", tags=[], due_date=due_date, created_at=now, updated_at=now))
+        db.commit()
+
+
+class FlakySink:
+    name = "flaky"
+
+    def __init__(self):
+        self.down = True
+        self.received = []
+
+    def emit(self, events):
+        if self.down:
+            raise RuntimeError("sink down")
+        self.received.extend(e.title for e in events)
+
+
+def test_scan_emits_each_due_task_once(session_factory):
+    t0 = datetime(2025, 9, 15, 12, 0, tzinfo=timezone.utc)
+    bus = PubSubSink()
+    inbox = bus.subscribe()
+    flaky = FlakySink()
+
+    with session_factory() as db:
+        first = scan_due_tasks(db, [flaky, bus], now=t0)
+    assert first["events"] == 0
+
+    _add_task(session_factory, "already overdue", t0 - timedelta(days=1))
+    _add_task(session_factory, "due soon", t0 + timedelta(seconds=30))
+    _add_task(session_factory, "done", t0 + timedelta(seconds=30), status="done")
+    _add_task(session_factory, "later", t0 + timedelta(hours=1))
+
+    # A new session stands in for a restart: the watermark is persisted.
+    with session_factory() as db:
+        second = scan_due_tasks(db, [flaky, bus], now=t0 + timedelta(minutes=1))
+    assert second["events"] == 1
+    assert second["sink_errors"] == 1
+    assert second["lag_seconds"] == 60
+    assert second["max_event_delay_seconds"] == 30
+    event = inbox.get_nowait()
+    assert event.title == "due soon"
+    assert inbox.empty()
+
+    # The failed sink kept its watermark and gets the event once it recovers;
+    # the healthy sink is not sent it again.
+    flaky.down = False
+    with session_factory() as db:
+        third = scan_due_tasks(db, [flaky, bus], now=t0 + timedelta(minutes=2))
+    assert third["sink_errors"] == 0
+    assert third["lag_seconds"] == 120
+    assert flaky.received == ["due soon"]
+    assert inbox.empty()
+
+    with session_factory() as db:
+        fourth = scan_due_tasks(db, [flaky, bus], now=t0 + timedelta(minutes=3))
+    assert fourth["events"] == 0
+    assert flaky.received == ["due soon"]
+
+
+def test_failed_chunk_resumes_after_delivered_events(session_factory):
+    t0 = datetime(2025, 9, 15, 12, 0, tzinfo=timezone.utc)
+    batches = []
+
+    class SecondChunkFailsOnce:
+        name = "chunky"
+        failed = False
+
+        def emit(self, events):
+            if batches and not self.failed:
+                self.failed = True
+                raise RuntimeError("timeout")
+            batches.append([e.title for e in events])
+
+    sink = SecondChunkFailsOnce()
+    with session_factory() as db:
+        scan_due_tasks(db, [sink], now=t0)
+    for i in range(5):
+        _add_task(session_factory, f"t{i}", t0 + timedelta(seconds=i + 1))
+
+    with session_factory() as db:
+        first = scan_due_tasks(db, [sink], now=t0 + timedelta(minutes=1), batch_size=2)
+    assert first["sink_errors"] == 1
+    with session_factory() as db:
+        second = scan_due_tasks(db, [sink], now=t0 + timedelta(minutes=2), batch_size=2)
+    assert second["sink_errors"] == 0
+    assert batches == [["t0", "t1"], ["t2", "t3"], ["t4"]]
+
+
+def test_events_past_retry_window_are_dropped(session_factory, caplog):
+    t0 = datetime(2025, 9, 15, 12, 0, tzinfo=timezone.utc)
+    flaky = FlakySink()
+    with session_factory() as db:
+        scan_due_tasks(db, [flaky], now=t0)
+    _add_task(session_factory, "stale", t0 + timedelta(minutes=1))
+    _add_task(session_factory, "recent", t0 + timedelta(hours=2))
+
+    with session_factory() as db:
+        assert scan_due_tasks(db, [flaky], now=t0 + timedelta(minutes=5))["sink_errors"] == 1
+
+    # Back up only after the retry window passed: the stale event is logged and dropped.
+    flaky.down = False
+    with session_factory() as db:
+        result = scan_due_tasks(db, [flaky], now=t0 + timedelta(hours=3), retry_window=timedelta(hours=2))
+    assert result["dropped"] == 1
+    assert result["lag_seconds"] == 2 * 3600
+    assert flaky.received == ["recent"]
+    assert "dropping 1 events" in caplog.text
+
+
+def test_upgrade_adds_indexes_to_existing_tasks_table(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_tasks_due_date")
+        conn.exec_driver_sql("DROP INDEX ix_tasks_status_updated_at")
+
+    upgrade(engine)
+
+    names = {ix["name"] for ix in inspect(engine).get_indexes("tasks")}
+    assert {"ix_tasks_due_date", "ix_tasks_status_updated_at"} <= names
+
+
+def test_webhook_sink_posts_events(session_factory):
+    t0 = datetime(2025, 9, 15, 12, 0, tzinfo=timezone.utc)
+    posted = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+    sink = WebhookSink("http://hooks.local/due", post=lambda url, **kw: posted.append((url, kw)) or Response())
+    with session_factory() as db:
+        scan_due_tasks(db, [sink], now=t0)
+    _add_task(session_factory, "ping", t0 + timedelta(seconds=1))
+    with session_factory() as db:
+        scan_due_tasks(db, [sink], now=t0 + timedelta(seconds=5))
+
+    assert len(posted) == 1
+    url, kwargs = posted[0]
+    assert url == "http://hooks.local/due"
+    assert kwargs["json"]["events"][0]["title"] == "ping"
+
+
+def test_scheduler_records_metrics():
+    scheduler = Scheduler()
+    scheduler.add_job("ok", lambda: {"events": 2}, interval=60)
+    scheduler.add_job("broken", lambda: 1 / 0, interval=60)
+
+    async def run():
+        await scheduler.run_once("ok")
+        await scheduler.run_once("broken")
+
+    asyncio.run(run())
+    snap = scheduler.snapshot()
+    assert snap["ok"]["runs"] == 1
+    assert snap["ok"]["last_result"] == {"events": 2}
+    assert snap["broken"]["failures"] == 1
+    assert "ZeroDivisionError" in snap["broken"]["last_error"]
+
+    with pytest.raises(ValueError):
+        scheduler.add_job("ok", lambda: None, interval=1)
+
+
+def test_jobs_endpoint():
+    with TestClient(app) as client:
+        response = client.get("/v1/jobs/")
+    assert response.status_code == 200
+    assert response.json() == {}
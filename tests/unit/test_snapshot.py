@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.api.main import app
+from app.api import deps
+from app.db import Base
+from app.db.models import Task
+from app.services import tasks as task_service
+from app.services.archive import archive_done_tasks
+from app.services.snapshot import TaskRecord, check_and_repair, task_snapshot
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    db_path = tmp_path / "test_snapshot.db"
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield factory
+    task_snapshot.unload()
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def _seed_via_api(client: TestClient):
+    base = datetime(2025, 9, 15, 12, 0, tzinfo=timezone.utc)
+    specs = [
+        ("a", "high", ["work"], base + timedelta(days=3)),
+        ("b", "low", ["home"], None),
+        ("c", "high", ["work", "urgent"], base + timedelta(days=1)),
+        ("d", "med", [], base + timedelta(days=1)),
+        ("e", "low", ["work"], None),
+    ]
+    ids = []
+    for title, priority, tags, due in specs:
+        payload = {"title": title, "priority": priority, "tags": tags}
+        if due is not None:
+            payload["due_date"] = due.isoformat()
+        resp = client.post("/v1/tasks/", json=payload, headers={"Idempotency-Key": f"seed-{title}"})
+        assert resp.status_code == 201, resp.text
+        ids.append(resp.json()["id"])
+    return ids
+
+
+QUERIES = [
+    {},
+    {"status": "done"},
+    {"priority": "high"},
+    {"tag": "work"},
+    {"tag": "Work"},
+    {"tag": "work", "priority": "high"},
+    {"sort": "due_date"},
+    {"sort": "due_date", "limit": 2, "offset": 1},
+    {"limit": 2},
+    {"limit": 2, "offset": 2, "tag": "work"},
+    {"task_id": 1},
+    {"tag": "missing"},
+]
+
+
+def _list_all(client: TestClient):
+    return {str(q): client.get("/v1/tasks/", params=q).json() for q in QUERIES}
+
+
+def test_snapshot_matches_sql_through_writes(session_factory, client: TestClient):
+    ids = _seed_via_api(client)
+    assert task_snapshot.load(session_factory) == 5
+
+    client.patch(f"/v1/tasks/{ids[0]}", json={"status": "done", "tags": ["home"]})
+    client.delete(f"/v1/tasks/{ids[1]}")
+    client.post(
+        "/v1/tasks/batch",
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": "f", "tags": ["work"]}},
+                {"op": "update", "task_id": ids[2], "data": {"due_date": None}},
+                {"op": "delete", "task_id": ids[3]},
+            ]
+        },
+    )
+    client.post("/v1/tasks/", json={"title": "g", "tags": ["work"]}, headers={"Idempotency-Key": "late"})
+    client.post("/v1/tasks/", json={"title": "h", "tags": ["Work"]})
+
+    with session_factory() as db:
+        assert task_snapshot.serves(db)
+        assert task_snapshot.check_consistency(db) == []
+
+    from_snapshot = _list_all(client)
+    task_snapshot.unload()
+    from_sql = _list_all(client)
+    assert from_snapshot == from_sql
+    assert [t["title"] for t in from_sql[str({"tag": "work"})]] == ["c", "e", "f", "g"]
+    assert [t["title"] for t in from_sql[str({"tag": "Work"})]] == ["h"]
+
+
+def test_reload_keeps_serving_and_replays_concurrent_writes(session_factory, monkeypatch):
+    with session_factory() as db:
+        db.add_all([Task(title=t, status="todo", priority="med", tags=[]) for t in ("a", "b")])
+        db.commit()
+    task_snapshot.load(session_factory)
+
+    original = TaskRecord.from_task
+    interleaved = []
+
+    def from_task(task):
+        if not interleaved:
+            interleaved.append(task.id)
+            # Mid-stream: readers on other threads are not blocked...
+            reader = threading.Thread(target=lambda: interleaved.append(len(task_snapshot.query())))
+            reader.start()
+            reader.join(timeout=5)
+            # ...and writes committed now reach the rebuilt snapshot.
+            with session_factory() as db:
+                db.delete(db.get(Task, 2))
+                db.add(Task(title="c", status="todo", priority="med", tags=[]))
+                db.commit()
+        return original(task)
+
+    monkeypatch.setattr(TaskRecord, "from_task", staticmethod(from_task))
+    task_snapshot.load(session_factory)
+    monkeypatch.undo()
+
+    assert interleaved == [1, 2]
+    assert [r.title for r in task_snapshot.query()] == ["a", "c"]
+    with session_factory() as db:
+        assert task_snapshot.check_consistency(db) == []
+
+
+def test_archive_of_another_database_leaves_snapshot_alone(session_factory, tmp_path):
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    other_engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'other.db'}")
+    Base.metadata.create_all(bind=other_engine)
+    other_factory = sessionmaker(bind=other_engine)
+    for factory in (session_factory, other_factory):
+        with factory() as db:
+            db.add(Task(title="done", status="done", priority="med", tags=[], created_at=old, updated_at=old))
+            db.commit()
+    task_snapshot.load(session_factory)
+
+    with other_factory() as db:
+        assert archive_done_tasks(db, older_than=timedelta(days=30)) == 1
+    assert [r.title for r in task_snapshot.query()] == ["done"]
+
+
+def test_rollback_is_not_applied(session_factory):
+    task_snapshot.load(session_factory)
+    with session_factory() as db:
+        db.add(Task(title="ghost", status="todo", priority="med", tags=[]))
+        db.flush()
+        db.rollback()
+    assert len(task_snapshot) == 0
+
+
+def test_archive_and_drift_repair(session_factory):
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        for title, age in (("old", 60), ("keep", 0)):
+            updated = now - timedelta(days=age)
+            db.add(Task(title=title, status="done", priority="med", tags=[], created_at=updated, updated_at=updated))
+        db.commit()
+    task_snapshot.load(session_factory)
+
+    with session_factory() as db:
+        assert archive_done_tasks(db, older_than=timedelta(days=30)) == 1
+        assert [t.title for t in task_service.list_tasks(db)] == ["keep"]
+        assert task_snapshot.check_consistency(db) == []
+
+        # A write that bypasses the ORM is caught by the checker and repaired.
+        db.execute(update(Task).values(title="renamed"))
+        db.commit()
+        assert task_snapshot.check_consistency(db) == ["task 2 differs from database"]
+
+    assert check_and_repair(session_factory) == {"checked": True, "problems": 1}
+    with session_factory() as db:
+        assert [t.title for t in task_service.list_tasks(db)] == ["renamed"]